@@ -0,0 +1,202 @@
+"""Arquivo de missões da Central RoboSoco 5001 em SQLite.
+
+Cada missão encerrada grava um resumo, o desfecho de cada vítima e as leituras
+de cada tick num banco local (modo WAL, inserções em lote numa só transação).
+Os índices cobrem as consultas mais comuns, que também ficam disponíveis pela
+linha de comando.
+
+Uso:
+    python arquivo_missoes.py falta-kits
+    python arquivo_missoes.py nao-tratadas
+    python arquivo_missoes.py margem-bateria
+    python arquivo_missoes.py missoes --limite 20
+"""
+import argparse
+import os
+import sqlite3
+import threading
+import time
+
+CAMINHO_ARQUIVO_MISSOES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "missoes.db")
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS missoes (
+    id               INTEGER PRIMARY KEY,
+    inicio           TEXT NOT NULL,
+    fim              TEXT NOT NULL,
+    cenario          TEXT NOT NULL,
+    comprimento      REAL NOT NULL,
+    velocidade       REAL NOT NULL,
+    status           TEXT NOT NULL,
+    distancia        REAL NOT NULL,
+    bateria_final    REAL NOT NULL,
+    margem_bateria   REAL NOT NULL,
+    kits_usados      INTEGER NOT NULL,
+    kits_necessarios INTEGER NOT NULL,
+    falta_kits       INTEGER NOT NULL,
+    vitimas_total    INTEGER NOT NULL,
+    vitimas_detectadas INTEGER NOT NULL,
+    ticks            INTEGER NOT NULL,
+    relatorio        TEXT
+);
+
+CREATE TABLE IF NOT EXISTS vitimas (
+    missao_id         INTEGER NOT NULL REFERENCES missoes(id),
+    vitima_id         TEXT NOT NULL,
+    x                 REAL NOT NULL,
+    y                 REAL NOT NULL,
+    gravidade_inicial TEXT NOT NULL,
+    gravidade_final   TEXT NOT NULL,
+    estado            TEXT NOT NULL,
+    detectada         INTEGER NOT NULL,
+    foto              INTEGER NOT NULL,
+    kit               INTEGER NOT NULL,
+    PRIMARY KEY (missao_id, vitima_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS ticks (
+    missao_id        INTEGER NOT NULL REFERENCES missoes(id),
+    tick             INTEGER NOT NULL,
+    pos_x            REAL NOT NULL,
+    pos_y            REAL NOT NULL,
+    bateria          REAL NOT NULL,
+    temp             REAL,
+    gas              REAL,
+    risco_estrutural INTEGER,
+    status           TEXT,
+    PRIMARY KEY (missao_id, tick)
+) WITHOUT ROWID;
+
+-- Índices cobrindo as consultas da linha de comando
+CREATE INDEX IF NOT EXISTS idx_missoes_cenario_falta ON missoes (cenario, falta_kits);
+CREATE INDEX IF NOT EXISTS idx_missoes_velocidade_margem ON missoes (velocidade, margem_bateria);
+CREATE INDEX IF NOT EXISTS idx_vitimas_kit_gravidade ON vitimas (kit, gravidade_inicial, detectada);
+"""
+
+# Consultas prontas: (descrição, SQL)
+CONSULTAS = {
+    'falta-kits': (
+        "Falta de kits por cenário",
+        """SELECT cenario, COUNT(*) AS missoes, SUM(falta_kits > 0) AS com_falta,
+                  ROUND(AVG(falta_kits), 2) AS falta_media, MAX(falta_kits) AS falta_maxima
+           FROM missoes GROUP BY cenario ORDER BY falta_media DESC""",
+    ),
+    'nao-tratadas': (
+        "Vítimas sem kit por gravidade inicial",
+        """SELECT gravidade_inicial, COUNT(*) AS sem_kit, SUM(detectada) AS detectadas
+           FROM vitimas WHERE kit = 0 GROUP BY gravidade_inicial
+           ORDER BY CASE gravidade_inicial WHEN 'Crítico' THEN 0 WHEN 'Grave' THEN 1
+                                           WHEN 'Moderado' THEN 2 ELSE 3 END""",
+    ),
+    'margem-bateria': (
+        "Margem de bateria por velocidade",
+        """SELECT velocidade, COUNT(*) AS missoes, ROUND(MIN(margem_bateria), 1) AS margem_min,
+                  ROUND(AVG(margem_bateria), 1) AS margem_media, ROUND(MAX(margem_bateria), 1) AS margem_max
+           FROM missoes GROUP BY velocidade ORDER BY velocidade""",
+    ),
+    'missoes': (
+        "Últimas missões arquivadas",
+        """SELECT id, fim, cenario, velocidade, status, ROUND(distancia, 1) AS distancia,
+                  ROUND(bateria_final, 1) AS bateria, kits_usados, falta_kits, vitimas_detectadas
+           FROM missoes ORDER BY id DESC LIMIT :limite""",
+    ),
+}
+
+
+class ArquivoMissoes:
+    """Banco SQLite com o histórico das missões."""
+    def __init__(self, caminho=CAMINHO_ARQUIVO_MISSOES):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        self._esquema_criado = False
+
+    def _conectar(self):
+        # O banco só é criado no primeiro uso, não ao instanciar a central.
+        conexao = sqlite3.connect(self.caminho, timeout=10)
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("PRAGMA synchronous=NORMAL")
+        if not self._esquema_criado:
+            conexao.executescript(ESQUEMA)
+            self._esquema_criado = True
+        return conexao
+
+    def arquivar(self, resumos):
+        """Grava uma ou mais missões numa única transação e retorna os ids criados.
+
+        Cada resumo é um dict como o de CentralDeControle.resumo_missao(), com as
+        listas 'vitimas' (dicts) e 'ticks' (tuplas na ordem da tabela ticks).
+        """
+        ids = []
+        with self._lock:
+            conexao = self._conectar()
+            try:
+                with conexao:
+                    for resumo in resumos:
+                        cursor = conexao.execute(
+                            """INSERT INTO missoes (inicio, fim, cenario, comprimento, velocidade, status,
+                                   distancia, bateria_final, margem_bateria, kits_usados, kits_necessarios,
+                                   falta_kits, vitimas_total, vitimas_detectadas, ticks, relatorio)
+                               VALUES (:inicio, :fim, :cenario, :comprimento, :velocidade, :status,
+                                   :distancia, :bateria_final, :margem_bateria, :kits_usados, :kits_necessarios,
+                                   :falta_kits, :vitimas_total, :vitimas_detectadas, :ticks, :relatorio)""",
+                            {**resumo, 'ticks': len(resumo['ticks']), 'relatorio': resumo.get('relatorio')},
+                        )
+                        missao_id = cursor.lastrowid
+                        conexao.executemany(
+                            """INSERT INTO vitimas VALUES (:missao_id, :vitima_id, :x, :y, :gravidade_inicial,
+                                   :gravidade_final, :estado, :detectada, :foto, :kit)""",
+                            ({**vitima, 'missao_id': missao_id} for vitima in resumo['vitimas']),
+                        )
+                        conexao.executemany(
+                            "INSERT INTO ticks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            ((missao_id, *tick) for tick in resumo['ticks']),
+                        )
+                        ids.append(missao_id)
+            finally:
+                conexao.close()
+        return ids
+
+    def consultar(self, nome, **parametros):
+        """Executa uma das CONSULTAS e retorna (colunas, linhas)."""
+        _, sql = CONSULTAS[nome]
+        conexao = self._conectar()
+        try:
+            cursor = conexao.execute(sql, parametros)
+            colunas = [d[0] for d in cursor.description]
+            return colunas, cursor.fetchall()
+        finally:
+            conexao.close()
+
+
+def imprimir_tabela(colunas, linhas):
+    larguras = [max(len(str(c)), *(len(str(l[i])) for l in linhas)) if linhas else len(str(c))
+                for i, c in enumerate(colunas)]
+    print("  ".join(str(c).ljust(w) for c, w in zip(colunas, larguras)))
+    print("  ".join("-" * w for w in larguras))
+    for linha in linhas:
+        print("  ".join(str(v).ljust(w) for v, w in zip(linha, larguras)))
+
+
+# --- EXECUÇÃO PRINCIPAL ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Consultas ao arquivo de missões da Central RoboSoco 5001")
+    parser.add_argument("--banco", default=CAMINHO_ARQUIVO_MISSOES, help="caminho do banco SQLite")
+    parser.add_argument("consulta", choices=sorted(CONSULTAS), help="consulta a executar")
+    parser.add_argument("--limite", type=int, default=20, help="linhas da consulta 'missoes'")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.banco):
+        print(f"❌ Banco de missões não encontrado em '{args.banco}'")
+        raise SystemExit(1)
+
+    arquivo = ArquivoMissoes(args.banco)
+    inicio = time.perf_counter()
+    colunas, linhas = arquivo.consultar(args.consulta, limite=args.limite)
+    duracao = (time.perf_counter() - inicio) * 1000
+
+    print(f"--- {CONSULTAS[args.consulta][0].upper()} ---\n")
+    if linhas:
+        imprimir_tabela(colunas, linhas)
+    else:
+        print("Nenhuma missão arquivada.")
+    print(f"\n({len(linhas)} linha(s) em {duracao:.1f} ms)")
@@ -0,0 +1,599 @@
+"""Painel web da Central RoboSoco 5001.
+
+Serve uma página local via HTTP e empurra o estado da missão por WebSocket para
+quantos observadores estiverem conectados. O estado é amostrado da central numa
+thread própria, em taxa limitada, e enviado como patches (JSON Merge Patch) em
+relação ao quadro anterior; quem entra recebe o snapshot atual em cache.
+
+Uso:
+    python painel_web.py                      # missão sem Tk, só com o painel web
+    python painel_web.py --teste-carga 300    # mede quantos observadores a estação aguenta
+    python robosoco.py --web                  # interface Tk + painel web
+"""
+import argparse
+import asyncio
+import base64
+import concurrent.futures
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import struct
+import threading
+import time
+from collections import deque
+
+# --- CONFIGURAÇÕES DO PAINEL WEB ---
+HOST_PAINEL_WEB = "127.0.0.1"
+PORTA_PAINEL_WEB = 8765
+TAXA_QUADROS_WEB = 5        # Quadros por segundo, no máximo, enviados aos observadores
+FILA_MAXIMA_CLIENTE = 8     # Quadros pendentes antes de um observador lento ser ressincronizado
+PONTOS_TRAJETORIA = 50      # Mesmo histórico exibido no mapa da interface Tk
+ALERTAS_NO_SNAPSHOT = 20
+PONTOS_ROTA = 12            # Pontos de virada da rota planejada enviados por quadro
+
+GUID_WEBSOCKET = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+# --- ESTADO E PATCHES ---
+def montar_estado(central):
+    """Extrai da central o mesmo estado mostrado pela interface Tk."""
+    robo, cenario = central.robo, central.cenario
+    if robo is None or cenario is None:
+        return {}
+
+    pacote = central.ultimo_pacote or {}
+    return {
+        'robo': {
+            'pos_x': round(robo.posicao_atual, 1),
+            'pos_y': round(robo.pos_y, 1),
+            'bateria': round(robo.bateria, 1),
+            'status': pacote.get('status_robo', robo.status),
+            'kits': robo.kits_primeiros_socorros,
+            'fotos': len(robo.memoria_fotos),
+            'sensores': dict(pacote.get('sensores', {})),
+        },
+        'vitimas': {
+            v.id: {
+                'x': v.x,
+                'y': v.y,
+                'gravidade': v.gravidade,
+                'estado': v.estado,
+                'detectada': v.detectada_em is not None,
+                'foto': v.foto_tirada,
+                'kit': v.kit_aplicado,
+            }
+            for v in list(cenario.objetos)
+        },
+        'mapa': {
+            'obstaculos': [list(o) for o in central.obstaculos_conhecidos],
+            'rota': simplificar_rota(pacote.get('rota', [])),
+        },
+        'missao': {
+            'comprimento': cenario.comprimento,
+            'ativa': central.simulacao_ativa,
+            'concluida': central.missao_concluida,
+            'detectadas': len(central.vitimas_detectadas),
+        },
+    }
+
+
+def simplificar_rota(pontos, limite=PONTOS_ROTA):
+    """Reduz a rota aos seus pontos de virada e ao destino, arredondados a 0,1 m.
+
+    Em trechos retos a lista fica igual de um tick para o outro e some do patch,
+    em vez de reenviar todas as células da grade a cada quadro.
+    """
+    if not pontos:
+        return []
+    viradas = []
+    anterior = pontos[0]
+    direcao = None
+    for ponto in pontos[1:]:
+        nova = (round(ponto[0] - anterior[0], 3), round(ponto[1] - anterior[1], 3))
+        if nova == (0, 0):
+            continue
+        norma = math.hypot(*nova)
+        nova = (round(nova[0] / norma, 2), round(nova[1] / norma, 2))
+        if direcao is not None and nova != direcao:
+            viradas.append([round(anterior[0], 1), round(anterior[1], 1)])
+        direcao, anterior = nova, ponto
+    viradas.append([round(anterior[0], 1), round(anterior[1], 1)])
+    if len(viradas) > limite:
+        # Viradas mais distantes são cortadas, mas o destino sempre fica.
+        viradas = viradas[:limite - 1] + viradas[-1:]
+    return viradas
+
+
+def calcular_patch(antigo, novo):
+    """Retorna um JSON Merge Patch (RFC 7386) que transforma `antigo` em `novo`."""
+    patch = {}
+    for chave, valor in novo.items():
+        anterior = antigo.get(chave)
+        if valor == anterior:
+            continue
+        if isinstance(valor, dict) and isinstance(anterior, dict):
+            patch[chave] = calcular_patch(anterior, valor)
+        else:
+            patch[chave] = valor
+    for chave in antigo:
+        if chave not in novo:
+            patch[chave] = None
+    return patch
+
+
+# --- WEBSOCKET (RFC 6455, apenas o necessário para empurrar texto) ---
+def codificar_quadro(texto, opcode=0x1):
+    """Monta um quadro WebSocket do servidor (sem máscara) já pronto para o socket."""
+    dados = texto.encode("utf-8") if isinstance(texto, str) else texto
+    tamanho = len(dados)
+    if tamanho < 126:
+        cabecalho = struct.pack("!BB", 0x80 | opcode, tamanho)
+    elif tamanho < 1 << 16:
+        cabecalho = struct.pack("!BBH", 0x80 | opcode, 126, tamanho)
+    else:
+        cabecalho = struct.pack("!BBQ", 0x80 | opcode, 127, tamanho)
+    return cabecalho + dados
+
+
+async def ler_quadro(reader):
+    """Lê um quadro WebSocket e retorna (opcode, payload), desfazendo a máscara se houver."""
+    b1, b2 = await reader.readexactly(2)
+    tamanho = b2 & 0x7F
+    if tamanho == 126:
+        tamanho, = struct.unpack("!H", await reader.readexactly(2))
+    elif tamanho == 127:
+        tamanho, = struct.unpack("!Q", await reader.readexactly(8))
+    mascara = await reader.readexactly(4) if b2 & 0x80 else None
+    payload = await reader.readexactly(tamanho)
+    if mascara:
+        payload = bytes(b ^ mascara[i % 4] for i, b in enumerate(payload))
+    return b1 & 0x0F, payload
+
+
+def chave_aceite(chave_cliente):
+    digest = hashlib.sha1((chave_cliente + GUID_WEBSOCKET).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+class _Observador:
+    """Conexão WebSocket de um observador, com fila limitada de quadros."""
+    __slots__ = ('writer', 'fila', 'ressincronizar')
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.fila = asyncio.Queue(maxsize=FILA_MAXIMA_CLIENTE)
+        self.ressincronizar = False
+
+    def enviar(self, quadro):
+        if self.ressincronizar:
+            return
+        try:
+            self.fila.put_nowait(quadro)
+        except asyncio.QueueFull:
+            # Observador lento: descarta os patches pendentes e envia um snapshot novo.
+            while not self.fila.empty():
+                self.fila.get_nowait()
+            self.ressincronizar = True
+            self.fila.put_nowait(None)
+
+
+class PainelWeb:
+    """Servidor HTTP/WebSocket que espelha a central para vários observadores."""
+    def __init__(self, central, host=HOST_PAINEL_WEB, porta=PORTA_PAINEL_WEB, taxa_quadros=TAXA_QUADROS_WEB):
+        self.central = central
+        self.host = host
+        self.porta = porta
+        self.taxa_quadros = taxa_quadros
+        self.observadores = set()
+        self.pronto = threading.Event()
+        self.erro = None
+        self._estado = {}
+        self._seq = 0
+        self._ultimo_alerta = 0
+        self._alertas = deque(maxlen=ALERTAS_NO_SNAPSHOT)
+        self._trajetoria = deque(maxlen=PONTOS_TRAJETORIA)
+        self._snapshot_cache = None
+
+    def iniciar_em_segundo_plano(self):
+        """Sobe o servidor numa thread e retorna True apenas se ele estiver ouvindo."""
+        threading.Thread(target=lambda: asyncio.run(self.servir()), daemon=True).start()
+        if not self.pronto.wait(5):
+            print(f"❌ Painel web não respondeu ao iniciar em http://{self.host}:{self.porta}/")
+            return False
+        if self.erro is not None:
+            print(f"❌ Não foi possível iniciar o painel web em {self.host}:{self.porta}: {self.erro}")
+            return False
+        print(f"🌐 Painel web disponível em http://{self.host}:{self.porta}/")
+        return True
+
+    async def servir(self):
+        try:
+            servidor = await asyncio.start_server(self._atender, self.host, self.porta)
+        except Exception as e:
+            # Ex.: porta ocupada. O erro fica para quem está esperando em `pronto`.
+            self.erro = e
+            self.pronto.set()
+            return
+        self.porta = servidor.sockets[0].getsockname()[1]
+        self.pronto.set()
+        async with servidor:
+            await self._transmitir()
+
+    async def _transmitir(self):
+        intervalo = 1.0 / self.taxa_quadros
+        erro_anterior = None
+        while True:
+            inicio = time.perf_counter()
+            try:
+                self._publicar()
+                erro_anterior = None
+            except Exception as e:
+                # A central é escrita pela thread da missão; um quadro ruim não pode parar a
+                # transmissão. Cada erro é registrado uma vez, não a cada quadro.
+                if repr(e) != erro_anterior:
+                    erro_anterior = repr(e)
+                    print(f"⚠️ Erro ao publicar quadro do painel web: {e!r}")
+            await asyncio.sleep(max(0.0, intervalo - (time.perf_counter() - inicio)))
+
+    def _publicar(self):
+        """Amostra a central e envia o mesmo quadro de patch para todos os observadores."""
+        novo = montar_estado(self.central)
+        patch = calcular_patch(self._estado, novo)
+
+        alertas_novos = [a for a in list(self.central.alertas) if a[0] > self._ultimo_alerta]
+        if alertas_novos:
+            self._ultimo_alerta = alertas_novos[-1][0]
+            self._alertas.extend(alertas_novos)
+
+        if not patch and not alertas_novos:
+            return
+
+        self._estado = novo
+        self._seq += 1
+        self._snapshot_cache = None
+        robo = novo.get('robo')
+        if robo and (not self._trajetoria or self._trajetoria[-1] != [robo['pos_x'], robo['pos_y']]):
+            self._trajetoria.append([robo['pos_x'], robo['pos_y']])
+
+        if not self.observadores:
+            return
+        quadro = codificar_quadro(json.dumps({
+            'tipo': 'patch',
+            'seq': self._seq,
+            't': time.time(),
+            'patch': patch,
+            'alertas': alertas_novos,
+        }, ensure_ascii=False, separators=(',', ':')))
+        for observador in self.observadores:
+            observador.enviar(quadro)
+
+    def _quadro_snapshot(self):
+        """Quadro com o estado completo, reaproveitado por todos que entram no mesmo seq."""
+        if self._snapshot_cache is None:
+            self._snapshot_cache = codificar_quadro(self._texto_snapshot())
+        return self._snapshot_cache
+
+    def _texto_snapshot(self):
+        return json.dumps({
+            'tipo': 'snapshot',
+            'seq': self._seq,
+            't': time.time(),
+            'estado': self._estado,
+            'trajetoria': list(self._trajetoria),
+            'alertas': list(self._alertas),
+        }, ensure_ascii=False, separators=(',', ':'))
+
+    async def _atender(self, reader, writer):
+        try:
+            requisicao = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+
+        linhas = requisicao.decode("latin-1").split("\r\n")
+        partes = linhas[0].split(" ")
+        caminho = partes[1] if len(partes) > 1 else "/"
+        cabecalhos = {}
+        for linha in linhas[1:]:
+            if ":" in linha:
+                nome, valor = linha.split(":", 1)
+                cabecalhos[nome.strip().lower()] = valor.strip()
+
+        if caminho == "/ws" and cabecalhos.get("upgrade", "").lower() == "websocket":
+            await self._atender_websocket(reader, writer, cabecalhos)
+        elif caminho == "/":
+            self._responder(writer, "200 OK", "text/html; charset=utf-8", PAGINA_HTML.encode("utf-8"))
+        elif caminho == "/estado":
+            self._responder(writer, "200 OK", "application/json; charset=utf-8", self._texto_snapshot().encode("utf-8"))
+        else:
+            self._responder(writer, "404 Not Found", "text/plain; charset=utf-8", "Não encontrado".encode("utf-8"))
+
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    def _responder(self, writer, status, tipo, corpo):
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {tipo}\r\nContent-Length: {len(corpo)}\r\n"
+            f"Cache-Control: no-store\r\nConnection: close\r\n\r\n".encode("latin-1") + corpo
+        )
+
+    async def _atender_websocket(self, reader, writer, cabecalhos):
+        writer.write(
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {chave_aceite(cabecalhos.get('sec-websocket-key', ''))}\r\n\r\n".encode("latin-1")
+        )
+        observador = _Observador(writer)
+        # Snapshot e inscrição no mesmo passo síncrono: nenhum patch fica entre os dois.
+        observador.fila.put_nowait(self._quadro_snapshot())
+        self.observadores.add(observador)
+
+        leitura = asyncio.ensure_future(self._ler_ate_fechar(reader))
+        try:
+            while not leitura.done():
+                pendente = asyncio.ensure_future(observador.fila.get())
+                await asyncio.wait({pendente, leitura}, return_when=asyncio.FIRST_COMPLETED)
+                if not pendente.done():
+                    pendente.cancel()
+                    break
+                quadro = pendente.result()
+                if quadro is None:
+                    quadro = self._quadro_snapshot()
+                    observador.ressincronizar = False
+                writer.write(quadro)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.observadores.discard(observador)
+            leitura.cancel()
+
+    async def _ler_ate_fechar(self, reader):
+        """Consome os quadros do navegador até ele fechar a conexão."""
+        try:
+            while True:
+                opcode, _ = await ler_quadro(reader)
+                if opcode == 0x8:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+
+
+# --- TESTE DE CARGA ---
+async def _observador_de_carga(porta, resultado, fim):
+    reader, writer = await asyncio.open_connection(HOST_PAINEL_WEB, porta)
+    chave = base64.b64encode(os.urandom(16)).decode("ascii")
+    writer.write(
+        f"GET /ws HTTP/1.1\r\nHost: {HOST_PAINEL_WEB}:{porta}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {chave}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode("latin-1")
+    )
+    await writer.drain()
+    await reader.readuntil(b"\r\n\r\n")
+    resultado['conectados'] += 1
+
+    try:
+        while time.time() < fim:
+            _, payload = await asyncio.wait_for(ler_quadro(reader), timeout=max(0.01, fim - time.time()))
+            mensagem = json.loads(payload)
+            resultado['quadros'] += 1
+            resultado['bytes'] += len(payload)
+            resultado['latencias'].append(time.time() - mensagem['t'])
+            if mensagem['tipo'] == 'snapshot':
+                resultado['snapshots'] += 1
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def _executar_observadores(porta, observadores, duracao):
+    """Roda os clientes do teste de carga; chamada num processo separado do servidor."""
+    resultado = {'conectados': 0, 'quadros': 0, 'bytes': 0, 'snapshots': 0, 'latencias': []}
+
+    async def executar():
+        fim = time.time() + duracao
+        tarefas = [asyncio.ensure_future(_observador_de_carga(porta, resultado, fim)) for _ in range(observadores)]
+        await asyncio.gather(*tarefas, return_exceptions=True)
+
+    asyncio.run(executar())
+    return resultado
+
+
+def _medir_atraso_loop(amostras, parar, periodo=0.01):
+    # Uma thread a 100 Hz faz o papel do loop da missão: o atraso no despertar dela
+    # mostra quanto o painel web disputa o interpretador com a simulação.
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        time.sleep(periodo)
+        amostras.append(time.perf_counter() - inicio - periodo)
+
+
+def teste_carga(observadores, duracao, central):
+    """Conecta `observadores` clientes ao painel e imprime vazão, latência e atraso do loop.
+
+    Os clientes rodam em outro processo, para que o custo deles não entre na
+    disputa pelo GIL com o servidor e a missão medidos aqui.
+    """
+    painel = PainelWeb(central, porta=0)
+    if not painel.iniciar_em_segundo_plano():
+        return
+
+    atrasos, parar = [], threading.Event()
+    medidor = threading.Thread(target=_medir_atraso_loop, args=(atrasos, parar), daemon=True)
+    medidor.start()
+
+    # "spawn" evita copiar via fork um processo que já tem as threads do servidor e da missão.
+    contexto = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=contexto) as executor:
+        resultado = executor.submit(_executar_observadores, painel.porta, observadores, duracao).result()
+    parar.set()
+    medidor.join()
+
+    def percentil(valores, p):
+        if not valores:
+            return 0.0
+        valores = sorted(valores)
+        return valores[min(len(valores) - 1, int(p * len(valores)))]
+
+    latencias = resultado['latencias']
+    print("\n--- TESTE DE CARGA DO PAINEL WEB ---")
+    print(f"Observadores conectados: {resultado['conectados']}/{observadores} durante {duracao:.0f}s (em processo separado)")
+    print(f"Quadros recebidos: {resultado['quadros']} ({resultado['quadros'] / max(1, resultado['conectados']) / duracao:.1f}/s por observador)")
+    print(f"Tráfego médio por quadro: {resultado['bytes'] / max(1, resultado['quadros']):.0f} bytes")
+    print(f"Snapshots (entrada + ressincronizações): {resultado['snapshots']}")
+    print(f"Latência p50/p95/máx: {percentil(latencias, 0.5) * 1000:.1f} / {percentil(latencias, 0.95) * 1000:.1f} / {max(latencias, default=0) * 1000:.1f} ms")
+    print(f"Atraso do loop a 100 Hz p50/p99/máx: {percentil(atrasos, 0.5) * 1000:.2f} / {percentil(atrasos, 0.99) * 1000:.2f} / {max(atrasos, default=0) * 1000:.2f} ms")
+    print("---------------------------------\n")
+
+
+# --- PÁGINA ---
+PAGINA_HTML = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>Central RoboSoco 5001</title>
+<style>
+  body { background:#0a1929; color:white; font-family:Arial, sans-serif; margin:10px; }
+  h1 { color:#007fff; font-size:20px; margin:0 0 10px 0; }
+  .grade { display:grid; grid-template-columns:2fr 1fr 1fr; gap:10px; }
+  .painel { background:#132f4c; padding:10px; border-radius:4px; }
+  .painel h2 { font-size:13px; margin:0 0 8px 0; }
+  canvas { background:#0c1a2a; width:100%; }
+  table { width:100%; font-size:12px; border-collapse:collapse; }
+  td { padding:2px 4px; }
+  #alertas { background:#0c1a2a; font-family:Consolas, monospace; font-size:12px; height:260px; overflow-y:auto; padding:5px; }
+  .PERIGO { color:#F44336; } .SUCESSO { color:#4CAF50; } .ALERTA { color:#FF9800; }
+  #conexao { float:right; font-size:12px; }
+</style>
+</head>
+<body>
+<h1>🤖 CENTRAL ROBOSOCO 5001 <span id="conexao">conectando...</span></h1>
+<div class="grade">
+  <div class="painel"><h2>MAPEAMENTO DO TÚNEL</h2><canvas id="mapa" width="800" height="300"></canvas></div>
+  <div class="painel"><h2>STATUS DO ROBÔ</h2><table id="status"></table><h2 style="margin-top:10px">ALERTAS ATIVOS</h2><div id="alertas"></div></div>
+  <div class="painel"><h2>VÍTIMAS</h2><table id="vitimas"></table></div>
+</div>
+<script>
+const CORES = {"Leve":"#4CAF50","Moderado":"#FF9800","Grave":"#F44336","Crítico":"#8B0000"};
+let estado = {}, trajetoria = [], seq = 0;
+
+function aplicarPatch(alvo, patch) {
+  for (const [chave, valor] of Object.entries(patch)) {
+    if (valor === null) delete alvo[chave];
+    else if (typeof valor === "object" && !Array.isArray(valor) && typeof alvo[chave] === "object") aplicarPatch(alvo[chave], valor);
+    else alvo[chave] = valor;
+  }
+}
+
+function adicionarAlertas(alertas) {
+  const div = document.getElementById("alertas");
+  for (const [, hora, tipo, mensagem] of alertas) {
+    const linha = document.createElement("div");
+    linha.className = tipo;
+    linha.textContent = `[${hora}] ${mensagem}`;
+    div.appendChild(linha);
+  }
+  while (div.childNodes.length > 100) div.removeChild(div.firstChild);
+  div.scrollTop = div.scrollHeight;
+}
+
+function desenhar() {
+  const robo = estado.robo, missao = estado.missao || {comprimento: 200};
+  const canvas = document.getElementById("mapa"), ctx = canvas.getContext("2d");
+  const sx = canvas.width / missao.comprimento, sy = canvas.height / 10;
+  ctx.clearRect(0, 0, canvas.width, canvas.height);
+  const mapa = estado.mapa || {obstaculos: [], rota: []};
+  ctx.fillStyle = "#666666";
+  for (const [x0, y0, x1, y1] of mapa.obstaculos) ctx.fillRect(x0 * sx, canvas.height - y1 * sy, (x1 - x0) * sx, (y1 - y0) * sy);
+  if (robo && mapa.rota.length) {
+    ctx.strokeStyle = "#FF9800"; ctx.setLineDash([6, 4]); ctx.beginPath();
+    ctx.moveTo(robo.pos_x * sx, canvas.height - robo.pos_y * sy);
+    for (const [x, y] of mapa.rota) ctx.lineTo(x * sx, canvas.height - y * sy);
+    ctx.stroke(); ctx.setLineDash([]);
+  }
+  ctx.strokeStyle = "#00ff88"; ctx.beginPath();
+  trajetoria.forEach(([x, y], i) => i ? ctx.lineTo(x * sx, canvas.height - y * sy) : ctx.moveTo(x * sx, canvas.height - y * sy));
+  ctx.stroke();
+  for (const v of Object.values(estado.vitimas || {})) {
+    ctx.fillStyle = CORES[v.gravidade] || "white";
+    ctx.font = "bold 18px Arial";
+    ctx.fillText("✕", v.x * sx - 6, canvas.height - v.y * sy + 6);
+  }
+  if (robo) {
+    ctx.fillStyle = "#007fff"; ctx.beginPath();
+    ctx.arc(robo.pos_x * sx, canvas.height - robo.pos_y * sy, 8, 0, 2 * Math.PI); ctx.fill();
+    const s = robo.sensores || {};
+    document.getElementById("status").innerHTML = [
+      ["Posição", `${robo.pos_x.toFixed(1)} m`], ["Bateria", `${robo.bateria.toFixed(1)}%`],
+      ["Status", robo.status], ["Temperatura", `${s.temp ?? "--"}°C`], ["Gás", s.gas ?? "--"],
+      ["Risco Estrutural", s.risco_estrutural ?? "--"], ["Kits Restantes", robo.kits], ["Fotos", robo.fotos],
+      ["Vítimas Detectadas", missao.detectadas ?? 0]
+    ].map(([k, v]) => `<tr><td>${k}:</td><td><b>${v}</b></td></tr>`).join("");
+  }
+  document.getElementById("vitimas").innerHTML = Object.entries(estado.vitimas || {}).map(([id, v]) =>
+    `<tr><td><b>${id}</b></td><td style="color:${CORES[v.gravidade]}">${v.gravidade}</td><td>${v.estado}</td>` +
+    `<td>${v.detectada ? "🔍" : ""}${v.foto ? "📷" : ""}${v.kit ? "🩺" : ""}</td></tr>`).join("");
+}
+
+function conectar() {
+  const ws = new WebSocket(`ws://${location.host}/ws`);
+  const conexao = document.getElementById("conexao");
+  ws.onopen = () => conexao.textContent = "ao vivo";
+  ws.onclose = () => { conexao.textContent = "reconectando..."; setTimeout(conectar, 2000); };
+  ws.onmessage = (evento) => {
+    const msg = JSON.parse(evento.data);
+    if (msg.tipo === "snapshot") {
+      estado = msg.estado; trajetoria = msg.trajetoria;
+      document.getElementById("alertas").innerHTML = "";
+    } else {
+      if (msg.seq !== seq + 1) { ws.close(); return; }
+      aplicarPatch(estado, msg.patch);
+      if (msg.patch.robo && ("pos_x" in msg.patch.robo || "pos_y" in msg.patch.robo)) {
+        trajetoria.push([estado.robo.pos_x, estado.robo.pos_y]);
+        if (trajetoria.length > __PONTOS_TRAJETORIA__) trajetoria.shift();
+      }
+    }
+    seq = msg.seq;
+    adicionarAlertas(msg.alertas);
+    desenhar();
+  };
+}
+conectar();
+</script>
+</body>
+</html>
+""".replace("__PONTOS_TRAJETORIA__", str(PONTOS_TRAJETORIA))
+
+
+# --- EXECUÇÃO PRINCIPAL ---
+if __name__ == "__main__":
+    from robosoco import Cenario, CentralDeControle, Robo
+
+    parser = argparse.ArgumentParser(description="Painel web da Central RoboSoco 5001")
+    parser.add_argument("--porta", type=int, default=PORTA_PAINEL_WEB)
+    parser.add_argument("--teste-carga", type=int, metavar="OBSERVADORES", help="executa o teste de carga com N observadores")
+    parser.add_argument("--duracao", type=float, default=15.0, help="duração do teste de carga em segundos")
+    args = parser.parse_args()
+
+    cenario_tunel = Cenario()
+    central_obj = CentralDeControle()
+    robo_obj = Robo(central_controle=central_obj)
+    central_obj.iniciar_missao(robo_obj, cenario_tunel)
+
+    if args.teste_carga:
+        teste_carga(args.teste_carga, args.duracao, central_obj)
+    elif PainelWeb(central_obj, porta=args.porta).iniciar_em_segundo_plano():
+        try:
+            while not central_obj.missao_concluida:
+                time.sleep(1)
+            print("✅ Missão encerrada. Painel continua no ar (Ctrl+C para sair).")
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+    central_obj.encerrar_missao()
+    robo_obj.memoria_fotos.fechar()
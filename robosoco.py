@@ -8,14 +8,53 @@ import threading
 import time
 import random
 from PIL import Image, ImageTk
+from collections import OrderedDict, deque
+from array import array
 import io
 import os
+import mmap
+import tempfile
+import itertools
+import heapq
+import math
+import sys
+from arquivo_missoes import ArquivoMissoes
 
 # --- CONFIGURAÇÕES DE IMAGENS ---
 # Isso garante que o script encontre a pasta 'imagens' que está no mesmo diretório que ele.
 DIRETORIO_DO_SCRIPT = os.path.dirname(os.path.abspath(__file__))
 PASTA_IMAGENS = os.path.join(DIRETORIO_DO_SCRIPT, "imagens")
 
+# --- CONFIGURAÇÕES DA MEMÓRIA DE FOTOS ---
+# Orçamento de RAM para as imagens das fotos; o excedente vai para o disco.
+LIMITE_MEMORIA_FOTOS = 4 * 1024 * 1024
+
+# --- CONFIGURAÇÕES DA MISSÃO ---
+BATERIA_MINIMA_MISSAO = 5  # Abaixo disso (%) o robô encerra a varredura
+CUSTO_BATERIA_POR_METRO = 0.1  # Consumo de bateria (%) por metro percorrido
+INTERVALO_TICK = 0.5  # Segundos simulados entre dois pacotes de telemetria
+
+# --- CONFIGURAÇÕES DO PLANEJAMENTO DE ROTA ---
+LARGURA_TUNEL = 10.0           # Metros, mesma escala do mapa da interface
+RESOLUCAO_GRADE = 0.5          # Lado de cada célula da grade de ocupação (m)
+HORIZONTE_PLANEJAMENTO = 40.0  # Distância à frente do robô usada como meta de exploração (m)
+ALCANCE_SENSOR_OBSTACULOS = 8.0
+
+# --- CONFIGURAÇÕES DA ANÁLISE DE SENSORES ---
+JANELA_SENSORES = 120          # Amostras mantidas na janela deslizante de cada sensor
+ALFA_EWMA = 0.2                # Peso da amostra nova na média móvel exponencial
+LIMIAR_ANOMALIA_Z = 4.0        # Desvios-padrão para considerar uma leitura anômala
+AMOSTRAS_MINIMAS_ANOMALIA = 20 # Amostras necessárias antes de detectar anomalias
+
+# Limites avaliados sobre a média exponencial (e sua taxa de variação, por segundo).
+# Ficam acima da faixa nominal do simulador (gás 0-0.5, risco 1-3), e o alerta só
+# é liberado quando a média volta a ficar abaixo de `maximo - histerese`.
+LIMITES_SENSORES = {
+    'temp': {'nome': 'Temperatura', 'unidade': '°C', 'maximo': 45.0, 'histerese': 2.0, 'taxa_maxima': 2.0},
+    'gas': {'nome': 'Gás', 'unidade': '', 'maximo': 0.6, 'histerese': 0.1},
+    'risco_estrutural': {'nome': 'Risco Estrutural', 'unidade': '', 'maximo': 3.5, 'histerese': 0.5},
+}
+
 
 # Mapeamento dos arquivos
 MAP_CENARIOS = {
@@ -75,15 +114,19 @@ def verificar_pasta_imagens():
 # --- CLASSES PRINCIPAIS ---
 
 class Vitima:
+    # Sequência única: o id indexa a memória de fotos e o arquivo de missões.
+    _ids = itertools.count(1001)
+
     def __init__(self, x, y, gravidade=None, estado=None):
         self.x = x
         self.y = y
         self.gravidade = gravidade or random.choice(["Leve", "Moderado", "Grave", "Crítico"])
+        self.gravidade_inicial = self.gravidade
         self.estado = estado or random.choice(["Consciente", "Inconsciente", "Semi-consciente"])
         self.detectada_em = None
         self.foto_tirada = False
         self.kit_aplicado = False
-        self.id = f"V{random.randint(1000, 9999)}"
+        self.id = f"V{next(Vitima._ids)}"
         self.foto_data = self._gerar_imagem_vitima()
 
     def _get_nome_arquivo_imagem(self):
@@ -168,40 +211,598 @@ class Vitima:
         return self.gravidade in ["Crítico", "Grave", "Moderado"] and not self.kit_aplicado
 
 class Cenario:
-    def __init__(self, comprimento=200):
+    def __init__(self, comprimento=200, nome="Túnel Padrão"):
         self.comprimento = comprimento
+        self.nome = nome
         self.objetos = [
             Vitima(x=30, y=5, gravidade="Leve", estado="Consciente"),
             Vitima(x=80, y=3, gravidade="Moderado", estado="Semi-consciente"),
             Vitima(x=120, y=7, gravidade="Grave", estado="Inconsciente"),
             Vitima(x=180, y=4, gravidade="Crítico", estado="Inconsciente")
         ]
+        # Escombros como retângulos (x0, y0, x1, y1); o robô só os conhece ao se aproximar.
+        self.obstaculos = [
+            (55, 3.5, 58, 10),
+            (100, 0, 103, 6),
+            (150, 3, 152, 7)
+        ]
+
+class RegistroFoto:
+    """Metadados compactos de uma foto; offset >= 0 indica que a imagem está no disco."""
+    __slots__ = ('vitima_id', 'posicao', 'timestamp', 'gravidade', 'estado', 'offset', 'tamanho')
+
+    def __init__(self, vitima_id, posicao, gravidade, estado):
+        self.vitima_id = vitima_id
+        self.posicao = posicao
+        self.timestamp = time.time()
+        self.gravidade = gravidade
+        self.estado = estado
+        self.offset = -1
+        self.tamanho = 0
+
+    @property
+    def momento(self):
+        return datetime.datetime.fromtimestamp(self.timestamp)
+
+class ArmazemFotos:
+    """Memória de fotos do robô com orçamento fixo de RAM.
+
+    As imagens mais antigas que excedem o orçamento são gravadas como estão num
+    arquivo apenas de acréscimo, lido depois via mmap a partir do índice. Os PNG
+    já vêm comprimidos, então não passam por outra compressão.
+    """
+    def __init__(self, limite_bytes=LIMITE_MEMORIA_FOTOS, caminho_arquivo=None):
+        self.limite_bytes = limite_bytes
+        self._registros = []
+        self._indice = {}
+        self._imagens = OrderedDict()
+        self._bytes_em_memoria = 0
+        self._lock = threading.Lock()
+        self._mapa = None
+
+        if caminho_arquivo is None:
+            fd, caminho_arquivo = tempfile.mkstemp(prefix="robosoco_fotos_", suffix=".bin")
+            os.close(fd)
+            self._temporario = True
+        else:
+            self._temporario = False
+        self.caminho_arquivo = caminho_arquivo
+        self._arquivo = open(caminho_arquivo, "a+b")
+        self._tamanho_arquivo = self._arquivo.seek(0, os.SEEK_END)
+
+    def __len__(self):
+        return len(self._registros)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._registros))
+
+    def __contains__(self, vitima_id):
+        return vitima_id in self._indice
+
+    @property
+    def bytes_em_memoria(self):
+        return self._bytes_em_memoria
+
+    @property
+    def bytes_em_disco(self):
+        return self._tamanho_arquivo
+
+    def adicionar(self, vitima_id, posicao, gravidade, estado, imagem=None):
+        """Registra uma foto e guarda a imagem, descarregando o excedente para o disco.
+
+        Depois de `fechar()` não registra nada e retorna None.
+        """
+        registro = RegistroFoto(vitima_id, posicao, gravidade, estado)
+        with self._lock:
+            if self._arquivo.closed:
+                return None
+            anterior = self._indice.get(vitima_id)
+            if anterior is not None:
+                # Uma nova foto do mesmo id substitui a anterior; se ela já estava
+                # no disco, os bytes antigos apenas deixam de ser referenciados.
+                self._registros.remove(anterior)
+                antiga = self._imagens.pop(vitima_id, None)
+                if antiga is not None:
+                    self._bytes_em_memoria -= len(antiga)
+            self._registros.append(registro)
+            self._indice[vitima_id] = registro
+            if imagem:
+                self._imagens[vitima_id] = imagem
+                self._bytes_em_memoria += len(imagem)
+                self._descarregar_excedente()
+        return registro
+
+    def obter_registro(self, vitima_id):
+        return self._indice.get(vitima_id)
+
+    def obter_imagem(self, vitima_id):
+        """Retorna os bytes PNG da foto, esteja ela na RAM ou no disco (None após `fechar()`)."""
+        with self._lock:
+            if self._arquivo.closed:
+                return None
+            imagem = self._imagens.get(vitima_id)
+            if imagem is not None:
+                self._imagens.move_to_end(vitima_id)
+                return imagem
+
+            registro = self._indice.get(vitima_id)
+            if registro is None or registro.offset < 0:
+                return None
+            fim = registro.offset + registro.tamanho
+            return self._mapear(fim)[registro.offset:fim]
+
+    def fechar(self):
+        with self._lock:
+            if self._mapa is not None:
+                self._mapa.close()
+                self._mapa = None
+            if not self._arquivo.closed:
+                self._arquivo.close()
+            if self._temporario and os.path.exists(self.caminho_arquivo):
+                os.remove(self.caminho_arquivo)
+
+    def _descarregar_excedente(self):
+        """Move as imagens menos usadas para o disco até caber no orçamento."""
+        gravou = False
+        while self._bytes_em_memoria > self.limite_bytes and self._imagens:
+            vitima_id, imagem = self._imagens.popitem(last=False)
+            self._bytes_em_memoria -= len(imagem)
+
+            registro = self._indice[vitima_id]
+            registro.offset = self._tamanho_arquivo
+            registro.tamanho = len(imagem)
+            self._arquivo.write(imagem)
+            self._tamanho_arquivo += len(imagem)
+            gravou = True
+
+        if gravou:
+            self._arquivo.flush()
+
+    def _mapear(self, fim):
+        # O mapa só é refeito quando o arquivo cresceu além da região já mapeada.
+        if self._mapa is None or len(self._mapa) < fim:
+            if self._mapa is not None:
+                self._mapa.close()
+            self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mapa
+
+class JanelaSensor:
+    """Estatísticas de um sensor numa janela deslizante, atualizadas em O(1) por amostra.
+
+    Os valores ficam num buffer circular pré-alocado; média e variância usam a
+    atualização de Welford para janelas, e mínimo/máximo usam deques monotônicos.
+    Para o erro de arredondamento não se acumular, média e variância são
+    recalculadas a partir do buffer a cada `tamanho` amostras (O(1) amortizado)
+    e logo após um cancelamento grande, como a saída de um pico da janela.
+    """
+    BLOCOS_SPARKLINE = "▁▂▃▄▅▆▇█"
+
+    def __init__(self, tamanho=JANELA_SENSORES, alfa=ALFA_EWMA):
+        self.tamanho = tamanho
+        self.alfa = alfa
+        self._valores = array('d', bytes(8 * tamanho))
+        self._deque_min = deque()
+        self._deque_max = deque()
+        self.contador = 0
+        self.media = 0.0
+        self._m2 = 0.0
+        self.ewma = None
+        self.taxa = 0.0
+        self._ultimo_tempo = None
+
+    def __len__(self):
+        return min(self.contador, self.tamanho)
+
+    @property
+    def variancia(self):
+        n = len(self)
+        return max(0.0, self._m2 / (n - 1)) if n > 1 else 0.0
+
+    @property
+    def desvio(self):
+        return self.variancia ** 0.5
+
+    @property
+    def minimo(self):
+        return self._valores[self._deque_min[0] % self.tamanho] if self._deque_min else None
+
+    @property
+    def maximo(self):
+        return self._valores[self._deque_max[0] % self.tamanho] if self._deque_max else None
+
+    @property
+    def ultimo(self):
+        return self._valores[(self.contador - 1) % self.tamanho] if self.contador else None
+
+    def adicionar(self, valor, instante):
+        """Inclui uma amostra lida em `instante` (segundos) e atualiza todas as estatísticas.
+
+        Leituras não finitas (NaN, infinito) são descartadas e retornam False.
+        """
+        if not math.isfinite(valor):
+            return False
+        i = self.contador
+        pos = i % self.tamanho
+        m2_anterior = self._m2
+
+        if i < self.tamanho:
+            delta = valor - self.media
+            self.media += delta / (i + 1)
+            self._m2 += delta * (valor - self.media)
+        else:
+            antigo = self._valores[pos]
+            media_antiga = self.media
+            self.media += (valor - antigo) / self.tamanho
+            self._m2 += (valor - antigo) * (valor - self.media + antigo - media_antiga)
+        self._valores[pos] = valor
+
+        # Descarta índices que saíram da janela e os dominados pela nova amostra.
+        limite = i - self.tamanho
+        while self._deque_min and self._deque_min[0] <= limite:
+            self._deque_min.popleft()
+        while self._deque_max and self._deque_max[0] <= limite:
+            self._deque_max.popleft()
+        while self._deque_min and self._valores[self._deque_min[-1] % self.tamanho] >= valor:
+            self._deque_min.pop()
+        while self._deque_max and self._valores[self._deque_max[-1] % self.tamanho] <= valor:
+            self._deque_max.pop()
+        self._deque_min.append(i)
+        self._deque_max.append(i)
+
+        # A taxa de variação é medida sobre a média exponencial para não reagir a ruído.
+        if self.ewma is None:
+            self.ewma = valor
+        else:
+            ewma_anterior = self.ewma
+            self.ewma += self.alfa * (valor - self.ewma)
+            dt = instante - self._ultimo_tempo
+            self.taxa = (self.ewma - ewma_anterior) / dt if dt > 0 else 0.0
+        self._ultimo_tempo = instante
+        self.contador = i + 1
+
+        if self.contador % self.tamanho == 0 or self._m2 * 1e3 < m2_anterior:
+            self._recalcular()
+        return True
+
+    def _recalcular(self):
+        n = len(self)
+        valores = self._valores if n == self.tamanho else self._valores[:n]
+        self.media = math.fsum(valores) / n
+        self._m2 = math.fsum((v - self.media) ** 2 for v in valores)
+
+    def sparkline(self, largura=30):
+        """Desenha as últimas amostras da janela como uma linha de blocos Unicode."""
+        n = len(self)
+        if n == 0:
+            return ""
+        minimo, maximo = self.minimo, self.maximo
+        amplitude = maximo - minimo
+        niveis = len(self.BLOCOS_SPARKLINE) - 1
+        quantidade = min(largura, n)
+        inicio = self.contador - quantidade
+        blocos = []
+        for i in range(inicio, self.contador):
+            valor = self._valores[i % self.tamanho]
+            nivel = int((valor - minimo) / amplitude * niveis) if amplitude > 0 else 0
+            blocos.append(self.BLOCOS_SPARKLINE[nivel])
+        return "".join(blocos)
+
+class AnalisadorSensores:
+    """Estágio de análise entre o motor da simulação e a interface.
+
+    Mantém uma JanelaSensor por sensor e devolve os alertas disparados por cada
+    pacote. Os alertas só disparam na transição para o estado de perigo, para
+    não inundar o painel enquanto a condição persiste.
+    """
+    def __init__(self, limites=None):
+        self.limites = limites or LIMITES_SENSORES
+        self.janelas = {sensor: JanelaSensor() for sensor in self.limites}
+        self._em_alerta = set()
+
+    def processar(self, sensores, instante=None):
+        """Processa o bloco 'sensores' de um pacote e retorna uma lista de (tipo, mensagem)."""
+        instante = time.monotonic() if instante is None else instante
+        alertas = []
+        for sensor, config in self.limites.items():
+            valor = sensores.get(sensor)
+            if valor is None or not math.isfinite(valor):
+                continue
+            janela = self.janelas[sensor]
+
+            # O z-score é calculado antes de a amostra entrar na janela.
+            anomalia = False
+            if len(janela) >= AMOSTRAS_MINIMAS_ANOMALIA and janela.desvio > 0:
+                anomalia = abs(valor - janela.media) / janela.desvio > LIMIAR_ANOMALIA_Z
+            janela.adicionar(valor, instante)
+
+            nome, unidade = config['nome'], config['unidade']
+            limite = config['maximo']
+            if (sensor, 'maximo') in self._em_alerta:
+                limite -= config.get('histerese', 0.0)
+            if self._disparou((sensor, 'maximo'), janela.ewma > limite):
+                alertas.append(("PERIGO", f"{nome} elevado(a): {janela.ewma:.2f}{unidade} (limite {config['maximo']}{unidade})"))
+            if 'taxa_maxima' in config and self._disparou((sensor, 'taxa'), janela.taxa > config['taxa_maxima']):
+                alertas.append(("PERIGO", f"{nome} subindo rápido: {janela.taxa:+.2f}{unidade}/s"))
+            if self._disparou((sensor, 'anomalia'), anomalia):
+                alertas.append(("PERIGO", f"Leitura anômala de {nome}: {valor}{unidade} (média {janela.media:.2f}{unidade})"))
+        return alertas
+
+    def _disparou(self, chave, condicao):
+        """Retorna True apenas quando a condição passa de falsa para verdadeira."""
+        if not condicao:
+            self._em_alerta.discard(chave)
+            return False
+        if chave in self._em_alerta:
+            return False
+        self._em_alerta.add(chave)
+        return True
+
+    def resumo(self, sensor):
+        janela = self.janelas[sensor]
+        if not len(janela):
+            return "--"
+        unidade = self.limites[sensor]['unidade']
+        return f"{janela.ultimo:.2f}{unidade} (μ {janela.media:.2f} σ {janela.desvio:.2f})"
+
+class GradeTunel:
+    """Grade de ocupação do túnel, com um byte por célula (0 livre, 1 ocupada).
+
+    As células são inteiros `coluna * linhas + linha`, o que mantém a grade e
+    as estruturas do planejador compactas mesmo em túneis longos. Os custos dos
+    passos são inteiros (décimos de célula) para que empates no planejador sejam
+    exatos, sem erro de arredondamento.
+    """
+    DIRECOES = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+    PASSO_RETO = 10
+    PASSO_DIAGONAL = 14
+
+    def __init__(self, comprimento, largura=LARGURA_TUNEL, resolucao=RESOLUCAO_GRADE):
+        self.resolucao = resolucao
+        self.colunas = int(math.ceil(comprimento / resolucao))
+        self.linhas = int(math.ceil(largura / resolucao))
+        self.ocupacao = bytearray(self.colunas * self.linhas)
+
+    def celula(self, x, y):
+        coluna = min(max(int(x / self.resolucao), 0), self.colunas - 1)
+        linha = min(max(int(y / self.resolucao), 0), self.linhas - 1)
+        return coluna * self.linhas + linha
+
+    def centro(self, celula):
+        coluna, linha = divmod(celula, self.linhas)
+        return (coluna + 0.5) * self.resolucao, (linha + 0.5) * self.resolucao
+
+    def livre(self, celula):
+        return not self.ocupacao[celula]
+
+    def celula_livre_a_frente(self, x, y):
+        """Célula livre mais próxima de `y` na primeira coluna livre com x >= `x`, ou None."""
+        coluna_inicial, linha_ideal = divmod(self.celula(x, y), self.linhas)
+        linhas = sorted(range(self.linhas), key=lambda linha: abs(linha - linha_ideal))
+        for coluna in range(coluna_inicial, self.colunas):
+            for linha in linhas:
+                celula = coluna * self.linhas + linha
+                if not self.ocupacao[celula]:
+                    return celula
+        return None
+
+    def marcar_obstaculo(self, x0, y0, x1, y1):
+        """Ocupa as células cujo centro está no retângulo e retorna as que mudaram."""
+        novas = []
+        col_ini = max(0, int(math.ceil(x0 / self.resolucao - 0.5)))
+        col_fim = min(self.colunas - 1, int(math.floor(x1 / self.resolucao - 0.5)))
+        lin_ini = max(0, int(math.ceil(y0 / self.resolucao - 0.5)))
+        lin_fim = min(self.linhas - 1, int(math.floor(y1 / self.resolucao - 0.5)))
+        for coluna in range(col_ini, col_fim + 1):
+            for linha in range(lin_ini, lin_fim + 1):
+                celula = coluna * self.linhas + linha
+                if not self.ocupacao[celula]:
+                    self.ocupacao[celula] = 1
+                    novas.append(celula)
+        return novas
+
+    def vizinhos(self, celula):
+        """Gera (vizinha, custo do passo) para cada passo livre, sem cortar quinas."""
+        if self.ocupacao[celula]:
+            return
+        coluna, linha = divmod(celula, self.linhas)
+        linhas, ocupacao = self.linhas, self.ocupacao
+        for dc, dl in self.DIRECOES:
+            c, l = coluna + dc, linha + dl
+            if not (0 <= c < self.colunas and 0 <= l < linhas):
+                continue
+            vizinha = c * linhas + l
+            if ocupacao[vizinha]:
+                continue
+            if dc and dl:
+                if ocupacao[coluna * linhas + l] or ocupacao[c * linhas + linha]:
+                    continue
+                yield vizinha, self.PASSO_DIAGONAL
+            else:
+                yield vizinha, self.PASSO_RETO
+
+    def distancia(self, a, b):
+        """Distância octil na mesma unidade dos passos; consistente com vizinhos()."""
+        ca, la = divmod(a, self.linhas)
+        cb, lb = divmod(b, self.linhas)
+        dc, dl = abs(ca - cb), abs(la - lb)
+        return self.PASSO_RETO * max(dc, dl) + (self.PASSO_DIAGONAL - self.PASSO_RETO) * min(dc, dl)
+
+    def em_metros(self, custo):
+        return custo * self.resolucao / self.PASSO_RETO
+
+class PlanejadorRota:
+    """Planejador A* incremental (D* Lite) sobre a GradeTunel, com custo em bateria.
+
+    A busca parte da meta em direção ao robô e guarda g/rhs apenas das células
+    tocadas. Quando novos obstáculos são informados, só os vértices afetados
+    voltam para a fila de prioridade (heap), em vez de replanejar do zero.
+    """
+    INFINITO = float('inf')
+
+    def __init__(self, grade, custo_por_metro=CUSTO_BATERIA_POR_METRO):
+        self.grade = grade
+        # A busca usa os custos inteiros da grade; a bateria é proporcional a eles.
+        self.custo_por_metro = custo_por_metro
+        self.inicio = None
+        self.objetivo = None
+        self.expansoes = 0
+        self.ultimo_tempo_ms = 0.0
+
+    def definir_objetivo(self, inicio, objetivo):
+        """Começa uma busca nova; necessário apenas quando a meta muda."""
+        self.inicio = self._ultimo_inicio = inicio
+        self.objetivo = objetivo
+        self._g = {}
+        self._rhs = {objetivo: 0}
+        self._km = 0
+        self._fila = []
+        self._na_fila = {}
+        self._inserir(objetivo)
+        self._computar()
+
+    def atualizar_inicio(self, inicio):
+        """Move o início da busca para a célula atual do robô."""
+        self.inicio = inicio
+        if self.objetivo is not None:
+            self._computar()
+
+    def informar_obstaculos(self, celulas):
+        """Atualiza a rota após células passarem a ser ocupadas na grade."""
+        if self.objetivo is None or not celulas:
+            return
+        self._km += self._h(self._ultimo_inicio, self.inicio)
+        self._ultimo_inicio = self.inicio
+        afetadas = set()
+        for celula in celulas:
+            afetadas.add(celula)
+            coluna, linha = divmod(celula, self.grade.linhas)
+            for dc, dl in GradeTunel.DIRECOES:
+                c, l = coluna + dc, linha + dl
+                if 0 <= c < self.grade.colunas and 0 <= l < self.grade.linhas:
+                    afetadas.add(c * self.grade.linhas + l)
+        for celula in afetadas:
+            self._atualizar_vertice(celula)
+        self._computar()
+
+    def custo(self):
+        """Bateria (%) necessária para ir do início até a meta pela rota atual."""
+        if self.inicio is None:
+            return self.INFINITO
+        return self.grade.em_metros(self._rhs.get(self.inicio, self.INFINITO)) * self.custo_por_metro
+
+    def caminho(self):
+        """Retorna a lista de células do início até a meta, ou None se não houver rota."""
+        if self.custo() == self.INFINITO:
+            return None
+        celula, rota = self.inicio, [self.inicio]
+        g = self._g
+        for _ in range(len(self.grade.ocupacao)):
+            if celula == self.objetivo:
+                return rota
+            melhor, melhor_custo = None, self.INFINITO
+            for vizinha, passo in self.grade.vizinhos(celula):
+                custo = passo + g.get(vizinha, self.INFINITO)
+                if custo < melhor_custo:
+                    melhor, melhor_custo = vizinha, custo
+            if melhor is None:
+                return None
+            celula = melhor
+            rota.append(celula)
+        return None
+
+    def _h(self, a, b):
+        return self.grade.distancia(a, b)
+
+    def _chave(self, celula):
+        m = min(self._g.get(celula, self.INFINITO), self._rhs.get(celula, self.INFINITO))
+        return (m + self._h(self.inicio, celula) + self._km, m)
+
+    def _inserir(self, celula):
+        chave = self._chave(celula)
+        self._na_fila[celula] = chave
+        heapq.heappush(self._fila, (chave, celula))
+
+    def _atualizar_vertice(self, celula):
+        if celula != self.objetivo:
+            g = self._g
+            self._rhs[celula] = min(
+                (passo + g.get(vizinha, self.INFINITO)
+                 for vizinha, passo in self.grade.vizinhos(celula)),
+                default=self.INFINITO,
+            )
+        if self._g.get(celula, self.INFINITO) != self._rhs.get(celula, self.INFINITO):
+            self._inserir(celula)
+        else:
+            self._na_fila.pop(celula, None)
+
+    def _topo(self):
+        # Entradas antigas continuam no heap e são descartadas aqui (remoção preguiçosa).
+        fila = self._fila
+        while fila and self._na_fila.get(fila[0][1]) != fila[0][0]:
+            heapq.heappop(fila)
+        return fila[0] if fila else None
+
+    def _computar(self):
+        inicio_tempo = time.perf_counter()
+        g, rhs = self._g, self._rhs
+        while True:
+            topo = self._topo()
+            if topo is None:
+                break
+            chave_antiga, celula = topo
+            g_inicio = g.get(self.inicio, self.INFINITO)
+            if chave_antiga >= self._chave(self.inicio) and rhs.get(self.inicio, self.INFINITO) == g_inicio:
+                break
+
+            self.expansoes += 1
+            chave_nova = self._chave(celula)
+            if chave_antiga < chave_nova:
+                self._inserir(celula)
+            elif g.get(celula, self.INFINITO) > rhs.get(celula, self.INFINITO):
+                g[celula] = rhs[celula]
+                heapq.heappop(self._fila)
+                del self._na_fila[celula]
+                for vizinha, _ in self.grade.vizinhos(celula):
+                    self._atualizar_vertice(vizinha)
+            else:
+                g[celula] = self.INFINITO
+                heapq.heappop(self._fila)
+                del self._na_fila[celula]
+                self._atualizar_vertice(celula)
+                for vizinha, _ in self.grade.vizinhos(celula):
+                    self._atualizar_vertice(vizinha)
+        self.ultimo_tempo_ms = (time.perf_counter() - inicio_tempo) * 1000
 
 class Robo:
     def __init__(self, central_controle=None):
         self.central_controle = central_controle
-        self.memoria_fotos = []
+        self.memoria_fotos = ArmazemFotos()
         self.kits_primeiros_socorros = 3
         self.posicao_atual = 0
+        self.pos_y = LARGURA_TUNEL / 2
+        self.distancia_percorrida = 0.0
         self.bateria = 100.0
         self.temperatura = 25.0
         self.velocidade = 2.0
         self.status = "Pronto"
 
     def mover(self, distancia):
-        self.posicao_atual += distancia
-        self.bateria = max(0, self.bateria - (distancia * 0.1))
+        self.mover_para(self.posicao_atual + distancia, self.pos_y)
+
+    def mover_para(self, x, y):
+        """Desloca o robô em linha reta até (x, y), descontando a bateria pela distância."""
+        distancia = math.hypot(x - self.posicao_atual, y - self.pos_y)
+        self.posicao_atual = x
+        self.pos_y = y
+        self.distancia_percorrida += distancia
+        self.bateria = max(0, self.bateria - (distancia * CUSTO_BATERIA_POR_METRO))
         
     def tirar_foto(self, vitima):
         if vitima.tirar_foto():
-            foto_info = {
-                'vitima_id': vitima.id,
-                'posicao': self.posicao_atual,
-                'timestamp': datetime.datetime.now(),
-                'gravidade': vitima.gravidade,
-                'estado': vitima.estado
-            }
-            self.memoria_fotos.append(foto_info)
+            # A imagem passa a viver apenas na memória de fotos do robô.
+            imagem, vitima.foto_data = vitima.foto_data, None
+            self.memoria_fotos.adicionar(vitima.id, self.posicao_atual, vitima.gravidade, vitima.estado, imagem)
             return True
         return False
 
@@ -220,6 +821,29 @@ class CentralDeControle:
         self.simulacao_ativa = False
         self.vitima_selecionada = None
         self.missao_concluida = False
+        self.analisador_sensores = AnalisadorSensores()
+        # Estado compartilhado com outros painéis (ex.: painel_web), lido sem travar o loop da missão
+        self.ultimo_pacote = None
+        self.alertas = deque(maxlen=100)
+        self._seq_alertas = itertools.count(1)
+        # Histórico da missão para o arquivo SQLite
+        self.arquivo_missoes = ArquivoMissoes()
+        self.inicio_missao = None
+        self.ticks = []
+        # Navegação 2D (preparada em iniciar_missao)
+        self.grade = None
+        self.planejador = None
+        self.obstaculos_conhecidos = []
+        self.vitimas_descartadas = set()
+        self.meta_exploracao = 0.0
+        self.rota = []
+        self._thread_missao = None
+
+    def registrar_alerta(self, tipo, mensagem):
+        """Guarda o alerta no histórico da central e o repassa para a interface."""
+        self.alertas.append((next(self._seq_alertas), datetime.datetime.now().strftime('%H:%M:%S'), tipo, mensagem))
+        if self.gui:
+            self.gui.adicionar_alerta(tipo, mensagem)
 
     def selecionar_vitima(self, vitima):
         self.vitima_selecionada = vitima
@@ -240,13 +864,21 @@ class CentralDeControle:
         
         self.selecionar_vitima(self.vitimas_detectadas[proximo_idx])
 
+    def obter_foto_vitima(self, vitima):
+        """Retorna a imagem da vítima, buscando na memória do robô se ela já foi fotografada."""
+        if vitima.foto_data is not None:
+            return vitima.foto_data
+        if self.robo:
+            return self.robo.memoria_fotos.obter_imagem(vitima.id)
+        return None
+
     def gerar_relatorio_final(self):
         """Gera um relatório textual com o resumo da missão."""
         if not self.missao_concluida:
             return "A missão ainda não foi concluída."
 
         # Calcula o total de kits necessários com base no estado inicial de todas as vítimas no cenário
-        kits_necessarios_total = sum(1 for v in self.cenario.objetos if v.gravidade in ["Crítico", "Grave", "Moderado"])
+        kits_necessarios_total = sum(1 for v in self.cenario.objetos if v.gravidade_inicial in ["Crítico", "Grave", "Moderado"])
 
         status_final = "Concluída" if self.robo.posicao_atual >= self.cenario.comprimento else "Interrompida"
         
@@ -255,7 +887,7 @@ class CentralDeControle:
         relatorio += f"Status da Missão: {status_final}\n\n"
         
         relatorio += "--- Resumo da Operação ---\n"
-        relatorio += f"Distância Total Percorrida: {self.robo.posicao_atual:.1f}m\n"
+        relatorio += f"Distância Total Percorrida: {self.robo.distancia_percorrida:.1f}m\n"
         relatorio += f"Nível Final da Bateria: {self.robo.bateria:.1f}%\n"
         relatorio += f"Kits de Socorro Utilizados pelo Robô: {3 - self.robo.kits_primeiros_socorros}\n"
         relatorio += f"Total de Kits Necessários na Missão: {kits_necessarios_total}\n\n"
@@ -277,7 +909,11 @@ class CentralDeControle:
                 relatorio += f"\n  - Vítima ID: {vitima.id}\n"
                 relatorio += f"    Coordenadas (X, Y): ({vitima.x}m, {vitima.y}m)\n"
                 relatorio += f"    Gravidade: {vitima.gravidade}\n"
-                relatorio += f"    Registro de Campo: {'Sim' if vitima.foto_tirada else 'Não'}\n"
+                registro_foto = self.robo.memoria_fotos.obter_registro(vitima.id)
+                if registro_foto:
+                    relatorio += f"    Registro de Campo: Sim ({registro_foto.posicao:.1f}m às {registro_foto.momento.strftime('%H:%M:%S')})\n"
+                else:
+                    relatorio += f"    Registro de Campo: {'Sim' if vitima.foto_tirada else 'Não'}\n"
                 relatorio += f"    Kit de Socorro Aplicado: {'Sim' if vitima.kit_aplicado else 'Não'}\n"
         return relatorio
 
@@ -286,8 +922,20 @@ class CentralDeControle:
         self.robo = robo
         self.cenario = cenario
         self.simulacao_ativa = True
-        
-        threading.Thread(target=self._executar_missao_completa, daemon=True).start()
+        # Janelas novas a cada missão, mantendo os limites configurados na central.
+        self.analisador_sensores = AnalisadorSensores(self.analisador_sensores.limites)
+        self.inicio_missao = datetime.datetime.now()
+        self.ticks = []
+        self._preparar_planejamento()
+        
+        self._thread_missao = threading.Thread(target=self._executar_missao_completa, daemon=True)
+        self._thread_missao.start()
+
+    def encerrar_missao(self, timeout=5):
+        """Interrompe a missão em andamento e espera o loop terminar (e arquivá-la)."""
+        self.simulacao_ativa = False
+        if self._thread_missao is not None and self._thread_missao.is_alive():
+            self._thread_missao.join(timeout)
 
     def _executar_missao_completa(self):
         if self.gui:
@@ -295,16 +943,23 @@ class CentralDeControle:
         
         while (self.simulacao_ativa and 
                self.robo.posicao_atual < self.cenario.comprimento and 
-               self.robo.bateria > 5):
+               self.robo.bateria > BATERIA_MINIMA_MISSAO):
             
-            self.robo.mover(self.robo.velocidade)
+            if not self._navegar():
+                if self.gui:
+                    self.gui.adicionar_mensagem_console("Navegação", "Nenhuma rota livre à frente!", "PERIGO")
+                self.registrar_alerta("PERIGO", "Rota bloqueada, missão interrompida")
+                break
             self.robo.temperatura = 25 + random.uniform(-1, 3)
             
             self._verificar_deteccao_vitimas()
             
             pacote_dados = {
+                # Momento da leitura no relógio da missão, independente de atrasos na entrega.
+                'instante': len(self.ticks) * INTERVALO_TICK,
                 'pos_x': self.robo.posicao_atual,
-                'pos_y': 5,
+                'pos_y': self.robo.pos_y,
+                'rota': self.rota,
                 'bateria': self.robo.bateria,
                 'status_robo': self._determinar_status(),
                 'sensores': {
@@ -313,45 +968,211 @@ class CentralDeControle:
                     'gas': round(random.uniform(0, 0.5), 2)
                 }
             }
+            alertas_sensores = self.analisador_sensores.processar(pacote_dados['sensores'], pacote_dados['instante'])
+            self.ultimo_pacote = pacote_dados
+            sensores = pacote_dados['sensores']
+            self.ticks.append((len(self.ticks), pacote_dados['pos_x'], pacote_dados['pos_y'], pacote_dados['bateria'],
+                               sensores['temp'], sensores['gas'], sensores['risco_estrutural'],
+                               pacote_dados['status_robo']))
             
             if self.gui:
                 self.gui.atualizar_interface_simulacao(pacote_dados)
+            for tipo, mensagem in alertas_sensores:
+                if self.gui:
+                    self.gui.adicionar_mensagem_console("Sensores", mensagem, tipo)
+                self.registrar_alerta(tipo, mensagem)
             
-            time.sleep(0.5)
+            time.sleep(INTERVALO_TICK)
         
         self.missao_concluida = True
+        self._arquivar_missao()
         if self.gui:
             status_final = "Concluída" if self.robo.posicao_atual >= self.cenario.comprimento else "Interrompida"
             self.gui.adicionar_mensagem_console("Missão", f"Missão {status_final}! Posição final: {self.robo.posicao_atual:.1f}m", "SUCESSO")
             self.gui.status_var.set(f"Missão {status_final}")
             self.gui.habilitar_botao_relatorio()
 
+    def resumo_missao(self):
+        """Monta o resumo da missão no formato esperado por ArquivoMissoes.arquivar."""
+        kits_necessarios = sum(1 for v in self.cenario.objetos if v.gravidade_inicial in ["Crítico", "Grave", "Moderado"])
+        kits_usados = 3 - self.robo.kits_primeiros_socorros
+        return {
+            'inicio': (self.inicio_missao or datetime.datetime.now()).isoformat(timespec='seconds'),
+            'fim': datetime.datetime.now().isoformat(timespec='seconds'),
+            'cenario': self.cenario.nome,
+            'comprimento': self.cenario.comprimento,
+            'velocidade': self.robo.velocidade,
+            'status': "Concluída" if self.robo.posicao_atual >= self.cenario.comprimento else "Interrompida",
+            'distancia': self.robo.distancia_percorrida,
+            'bateria_final': self.robo.bateria,
+            'margem_bateria': self.robo.bateria - BATERIA_MINIMA_MISSAO,
+            'kits_usados': kits_usados,
+            'kits_necessarios': kits_necessarios,
+            'falta_kits': kits_necessarios - kits_usados,
+            'vitimas_total': len(self.cenario.objetos),
+            'vitimas_detectadas': len(self.vitimas_detectadas),
+            'relatorio': self.gerar_relatorio_final(),
+            'vitimas': [
+                {
+                    'vitima_id': v.id,
+                    'x': v.x,
+                    'y': v.y,
+                    'gravidade_inicial': v.gravidade_inicial,
+                    'gravidade_final': v.gravidade,
+                    'estado': v.estado,
+                    'detectada': v.detectada_em is not None,
+                    'foto': v.foto_tirada,
+                    'kit': v.kit_aplicado,
+                }
+                for v in self.cenario.objetos
+            ],
+            'ticks': self.ticks,
+        }
+
+    def _arquivar_missao(self):
+        if not self.arquivo_missoes:
+            return
+        try:
+            self.arquivo_missoes.arquivar([self.resumo_missao()])
+        except Exception as e:
+            print(f"⚠️ Erro ao arquivar a missão: {e}")
+            if self.gui:
+                self.gui.adicionar_mensagem_console("Arquivo", f"Falha ao arquivar a missão: {e}", "PERIGO")
+
     def _verificar_deteccao_vitimas(self):
+        # Todas as vítimas no alcance são verificadas a cada tick: com duas próximas,
+        # parar na primeira impediria a foto e o kit da segunda.
+        alguma_no_alcance = False
         for vitima in self.cenario.objetos:
-            distancia = abs(vitima.x - self.robo.posicao_atual)
+            distancia = math.hypot(vitima.x - self.robo.posicao_atual, vitima.y - self.robo.pos_y)
             
-            if distancia < 5 and vitima not in self.vitimas_detectadas:
-                if vitima.detectar():
+            if distancia < 5:
+                alguma_no_alcance = True
+                if vitima not in self.vitimas_detectadas and vitima.detectar():
                     self.vitimas_detectadas.append(vitima)
                     
                     if self.gui:
                         self.gui.adicionar_mensagem_console("Detecção", f"Vítima {vitima.id} detectada!", "ALERTA")
-                        self.gui.adicionar_alerta("ALERTA", f"Vítima {vitima.id} - {vitima.gravidade}")
+                    self.registrar_alerta("ALERTA", f"Vítima {vitima.id} - {vitima.gravidade}")
                 
                 if distancia < 2 and not vitima.foto_tirada:
                     if self.robo.tirar_foto(vitima) and self.gui:
                         self.gui.adicionar_mensagem_console("Câmera", f"Foto da vítima {vitima.id}", "INFO")
                 
                 if distancia < 1 and vitima.necessita_kit() and self.robo.kits_primeiros_socorros > 0:
-                    if self.robo.aplicar_kit(vitima) and self.gui:
-                        self.gui.adicionar_mensagem_console("Socorro", f"Kit aplicado em {vitima.id}!", "SUCESSO")
-                        self.gui.adicionar_alerta("SUCESSO", f"Kit aplicado em {vitima.id}")
+                    if self.robo.aplicar_kit(vitima):
+                        if self.gui:
+                            self.gui.adicionar_mensagem_console("Socorro", f"Kit aplicado em {vitima.id}!", "SUCESSO")
+                        self.registrar_alerta("SUCESSO", f"Kit aplicado em {vitima.id}")
                 
                 if self.gui and not self.vitima_selecionada:
                     self.selecionar_vitima(vitima)
-                
-                return True
-        return False
+        return alguma_no_alcance
+
+    def _preparar_planejamento(self):
+        self.grade = GradeTunel(self.cenario.comprimento)
+        self.planejador = PlanejadorRota(self.grade)
+        self.obstaculos_conhecidos = []
+        self.vitimas_descartadas = set()
+        self.meta_exploracao = 0.0
+        self.rota = []
+
+    def _reportar_obstaculos(self):
+        """Marca na grade os obstáculos que entraram no alcance do sensor e atualiza a rota."""
+        x, y = self.robo.posicao_atual, self.robo.pos_y
+        novas = []
+        for obstaculo in self.cenario.obstaculos:
+            if obstaculo in self.obstaculos_conhecidos:
+                continue
+            x0, y0, x1, y1 = obstaculo
+            if math.hypot(max(x0 - x, 0, x - x1), max(y0 - y, 0, y - y1)) > ALCANCE_SENSOR_OBSTACULOS:
+                continue
+            self.obstaculos_conhecidos.append(obstaculo)
+            novas.extend(self.grade.marcar_obstaculo(*obstaculo))
+            if self.gui:
+                self.gui.adicionar_mensagem_console("Navegação", f"Obstáculo entre {x0}m e {x1}m, recalculando rota", "ALERTA")
+            self.registrar_alerta("ALERTA", f"Obstáculo detectado em {x0}-{x1}m")
+        self.planejador.informar_obstaculos(novas)
+
+    def _vitima_pendente(self, vitima):
+        if vitima in self.vitimas_descartadas:
+            return False
+        precisa_kit = vitima.necessita_kit() and self.robo.kits_primeiros_socorros > 0
+        return not vitima.foto_tirada or precisa_kit
+
+    def _escolher_alvo(self):
+        """Retorna (vítima, célula) da vítima pendente mais próxima ou (None, meta de exploração)."""
+        x, y = self.robo.posicao_atual, self.robo.pos_y
+        pendentes = [v for v in self.vitimas_detectadas if self._vitima_pendente(v)]
+        if pendentes:
+            vitima = min(pendentes, key=lambda v: math.hypot(v.x - x, v.y - y))
+            return vitima, self.grade.celula(vitima.x, vitima.y)
+
+        # A meta avança em saltos, para não trocar de objetivo (e replanejar do zero) a cada tick.
+        if self.meta_exploracao - x < HORIZONTE_PLANEJAMENTO / 2:
+            self.meta_exploracao = min(x + HORIZONTE_PLANEJAMENTO, self.cenario.comprimento)
+        # Um obstáculo sobre o eixo central não bloqueia o túnel: vale qualquer célula livre adiante.
+        objetivo = self.grade.celula_livre_a_frente(self.meta_exploracao, LARGURA_TUNEL / 2)
+        if objetivo is None:
+            objetivo = self.grade.celula(self.meta_exploracao, LARGURA_TUNEL / 2)
+        return None, objetivo
+
+    def _navegar(self):
+        """Avança o robô pela rota planejada por até `velocidade` metros; False se não houver rota."""
+        # O início precisa estar atualizado antes de os novos obstáculos entrarem na busca.
+        inicio = self.grade.celula(self.robo.posicao_atual, self.robo.pos_y)
+        self.planejador.atualizar_inicio(inicio)
+        self._reportar_obstaculos()
+
+        while True:
+            vitima, objetivo = self._escolher_alvo()
+            if objetivo != self.planejador.objetivo:
+                self.planejador.definir_objetivo(inicio, objetivo)
+            else:
+                self.planejador.atualizar_inicio(inicio)
+            if vitima is None:
+                break
+
+            if math.hypot(vitima.x - self.robo.posicao_atual, vitima.y - self.robo.pos_y) < 1:
+                # O robô já está sobre a vítima e as verificações do tick anterior não a
+                # resolveram; insistir nela prenderia o robô no lugar.
+                mensagem = f"Atendimento da vítima {vitima.id} não pôde ser concluído"
+            else:
+                # Só desvia se a bateria cobre a ida até a vítima e o restante do túnel a partir dela.
+                custo = self.planejador.custo() + math.hypot(self.cenario.comprimento - vitima.x, LARGURA_TUNEL / 2 - vitima.y) * CUSTO_BATERIA_POR_METRO
+                if custo <= self.robo.bateria - BATERIA_MINIMA_MISSAO:
+                    break
+                if custo == PlanejadorRota.INFINITO:
+                    mensagem = f"Sem rota até a vítima {vitima.id}"
+                else:
+                    mensagem = f"Vítima {vitima.id} fora de alcance: desvio exige {custo:.1f}% de bateria"
+            self.vitimas_descartadas.add(vitima)
+            if self.gui:
+                self.gui.adicionar_mensagem_console("Navegação", mensagem, "PERIGO")
+            self.registrar_alerta("PERIGO", mensagem)
+
+        rota = self.planejador.caminho()
+        if rota is None:
+            return False
+
+        pontos = [self.grade.centro(c) for c in rota[1:]]
+        if vitima is not None:
+            pontos.append((vitima.x, vitima.y))
+        elif self.meta_exploracao >= self.cenario.comprimento:
+            pontos.append((self.cenario.comprimento, self.grade.centro(objetivo)[1]))
+        self.rota = pontos
+
+        restante = self.robo.velocidade
+        for x, y in pontos:
+            distancia = math.hypot(x - self.robo.posicao_atual, y - self.robo.pos_y)
+            if distancia > restante:
+                fracao = restante / distancia
+                self.robo.mover_para(self.robo.posicao_atual + (x - self.robo.posicao_atual) * fracao,
+                                     self.robo.pos_y + (y - self.robo.pos_y) * fracao)
+                break
+            self.robo.mover_para(x, y)
+            restante -= distancia
+        return True
 
     def _determinar_status(self):
         if self.missao_concluida:
@@ -388,6 +1209,8 @@ class CentralControleGUI:
         self.fotos_var = tk.StringVar(value="0")
         self.kits_used_var = tk.StringVar(value="0")
         self.distancia_var = tk.StringVar(value="0.0 m")
+        self.sensores_vars = {sensor: (tk.StringVar(value="--"), tk.StringVar(value=""))
+                              for sensor in self.central.analisador_sensores.limites}
         
         self.setup_ui()
         
@@ -449,6 +1272,8 @@ class CentralControleGUI:
         self.robo_marker, = self.ax.plot([], [], 'o', color='#007fff', markersize=15, label='Robô')
         self.caminho_line, = self.ax.plot([], [], '.-', color='#00ff88', alpha=0.7, linewidth=2, label='Trajetória')
         self.vitimas_marker, = self.ax.plot([], [], 'X', color='red', markersize=12, label='Vítimas')
+        self.rota_line, = self.ax.plot([], [], '--', color='#FF9800', alpha=0.8, linewidth=1.5, label='Rota Planejada')
+        self.obstaculos_desenhados = 0
         
         self.ax.legend(facecolor='#132f4c', labelcolor='white')
         
@@ -492,6 +1317,18 @@ class CentralControleGUI:
         self.bateria_bar = ttk.Progressbar(info_grid, orient='horizontal', length=150, mode='determinate')
         self.bateria_bar.grid(row=1, column=2, sticky='w', padx=(10, 0))
         self.bateria_bar['value'] = 100
+        
+        # Sensores (valor atual, estatísticas da janela e histórico compacto)
+        sensores_frame = ttk.LabelFrame(status_frame, text="SENSORES", padding=5)
+        sensores_frame.pack(fill=tk.X, pady=5, expand=False)
+        
+        sensores_grid = ttk.Frame(sensores_frame)
+        sensores_grid.pack(fill=tk.X, padx=5, pady=5)
+        
+        for i, (sensor, (valor_var, spark_var)) in enumerate(self.sensores_vars.items()):
+            ttk.Label(sensores_grid, text=f"{self.central.analisador_sensores.limites[sensor]['nome']}:", font=('Arial', 9)).grid(row=2 * i, column=0, sticky='w', pady=(2, 0))
+            ttk.Label(sensores_grid, textvariable=valor_var, font=('Arial', 9, 'bold')).grid(row=2 * i, column=1, sticky='w', pady=(2, 0), padx=(10, 0))
+            ttk.Label(sensores_grid, textvariable=spark_var, font=('Consolas', 9), foreground='#00ff88').grid(row=2 * i + 1, column=0, columnspan=2, sticky='w')
             
         # Alertas
         alertas_frame = ttk.LabelFrame(status_frame, text="ALERTAS ATIVOS", padding=5)
@@ -569,7 +1406,7 @@ class CentralControleGUI:
         self.vitima_detalhes_frame.pack(fill=tk.BOTH, expand=True)
         
         try:
-            image = Image.open(io.BytesIO(vitima.foto_data))
+            image = Image.open(io.BytesIO(self.central.obter_foto_vitima(vitima)))
             image = image.resize((220, 220), Image.Resampling.LANCZOS)
             self.vitima_photo = ImageTk.PhotoImage(image)
             self.vitima_foto_label.configure(image=self.vitima_photo)
@@ -672,7 +1509,7 @@ class CentralControleGUI:
 
     def atualizar_interface_simulacao(self, dados):
         self.atualizar_status_robo(dados)
-        self.atualizar_mapa(dados['pos_x'], dados['pos_y'])
+        self.atualizar_mapa(dados['pos_x'], dados['pos_y'], dados.get('rota'))
         
         vitimas_count = len(self.central.vitimas_detectadas)
         fotos_count = len(self.central.robo.memoria_fotos)
@@ -681,12 +1518,12 @@ class CentralControleGUI:
         self.vitimas_var.set(str(vitimas_count))
         self.fotos_var.set(str(fotos_count))
         self.kits_used_var.set(str(kits_used))
-        self.distancia_var.set(f"{dados['pos_x']:.1f} m")
+        self.distancia_var.set(f"{self.central.robo.distancia_percorrida:.1f} m")
         
         self.ultima_atualizacao.set(datetime.datetime.now().strftime('%H:%M:%S'))
         self.status_var.set(dados['status_robo'])
 
-    def atualizar_mapa(self, x, y):
+    def atualizar_mapa(self, x, y, rota=None):
         self.historico_posicoes.append((x, y))
         if len(self.historico_posicoes) > 50: 
             self.historico_posicoes.pop(0)
@@ -701,6 +1538,18 @@ class CentralControleGUI:
         vitimas_y = [v.y for v in self.central.cenario.objetos]
         self.vitimas_marker.set_data(vitimas_x, vitimas_y)
         
+        if rota:
+            rota_x, rota_y = zip(*([(x, y)] + rota))
+            self.rota_line.set_data(rota_x, rota_y)
+        else:
+            self.rota_line.set_data([], [])
+        
+        # Desenha apenas os obstáculos que o robô descobriu desde a última atualização
+        conhecidos = self.central.obstaculos_conhecidos
+        for x0, y0, x1, y1 in conhecidos[self.obstaculos_desenhados:]:
+            self.ax.add_patch(plt.Rectangle((x0, y0), x1 - x0, y1 - y0, color='#666666', alpha=0.8))
+        self.obstaculos_desenhados = len(conhecidos)
+        
         self.canvas.draw_idle()
 
     def atualizar_status_robo(self, dados):
@@ -709,6 +1558,11 @@ class CentralControleGUI:
         self.temp_var.set(f"{dados['sensores']['temp']}°C")
         self.kits_var.set(str(self.central.robo.kits_primeiros_socorros))
         self.bateria_bar['value'] = dados['bateria']
+        
+        analisador = self.central.analisador_sensores
+        for sensor, (valor_var, spark_var) in self.sensores_vars.items():
+            valor_var.set(analisador.resumo(sensor))
+            spark_var.set(analisador.janelas[sensor].sparkline())
 
     def integrar_com_central(self, robo, cenario):
         self.central.robo = robo
@@ -741,6 +1595,11 @@ if __name__ == "__main__":
     gui = CentralControleGUI(central_obj)
     gui.integrar_com_central(robo_obj, cenario_tunel)
     
+    # Painel web opcional para outros observadores: python robosoco.py --web
+    if "--web" in sys.argv:
+        from painel_web import PainelWeb
+        PainelWeb(central_obj).iniciar_em_segundo_plano()
+    
     def iniciar_simulacao():
         time.sleep(2)
         central_obj.iniciar_missao(robo_obj, cenario_tunel)
@@ -748,4 +1607,7 @@ if __name__ == "__main__":
     threading.Thread(target=iniciar_simulacao, daemon=True).start()
     
     print("✅ Sistema pronto! Iniciando interface...")
-    gui.iniciar_interface()
\ No newline at end of file
+    gui.iniciar_interface()
+    # A missão ainda pode estar rodando: ela precisa parar antes de a memória de fotos fechar.
+    central_obj.encerrar_missao()
+    robo_obj.memoria_fotos.fechar()
\ No newline at end of file
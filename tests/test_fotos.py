@@ -0,0 +1,86 @@
+"""Testes da memória de fotos com orçamento de RAM e descarga para o disco."""
+import os
+
+import pytest
+
+from robosoco import ArmazemFotos
+
+
+@pytest.fixture
+def armazem():
+    armazem = ArmazemFotos(limite_bytes=2500)
+    yield armazem
+    armazem.fechar()
+
+
+def _imagem(marcador, tamanho=1000):
+    return bytes([marcador]) * tamanho
+
+
+def test_excedente_vai_para_o_disco_e_volta_pelo_mmap(armazem):
+    imagens = {f"V{i}": _imagem(i) for i in range(6)}
+    for vitima_id, imagem in imagens.items():
+        armazem.adicionar(vitima_id, 10.0, "Leve", "Consciente", imagem)
+
+    assert armazem.bytes_em_memoria <= armazem.limite_bytes
+    assert armazem.bytes_em_memoria + armazem.bytes_em_disco == 6000
+    assert armazem.obter_registro("V0").offset >= 0
+    assert armazem.obter_registro("V5").offset < 0
+    for vitima_id, imagem in imagens.items():
+        assert armazem.obter_imagem(vitima_id) == imagem
+    assert [r.vitima_id for r in armazem] == list(imagens)
+
+
+def test_substituir_foto_em_memoria(armazem):
+    armazem.adicionar("V1", 1.0, "Grave", "Consciente", _imagem(1))
+    armazem.adicionar("V1", 2.0, "Moderado", "Consciente", _imagem(2, 500))
+
+    assert armazem.bytes_em_memoria == 500
+    assert len(armazem) == 1
+    assert armazem.obter_registro("V1").posicao == 2.0
+    assert armazem.obter_imagem("V1") == _imagem(2, 500)
+
+
+def test_substituir_foto_que_ja_estava_no_disco(armazem):
+    armazem.adicionar("V1", 1.0, "Grave", "Consciente", _imagem(1))
+    armazem.adicionar("V2", 1.0, "Grave", "Consciente", _imagem(2))
+    armazem.adicionar("V3", 1.0, "Grave", "Consciente", _imagem(3))
+    assert armazem.obter_registro("V1").offset >= 0
+    em_memoria = armazem.bytes_em_memoria
+
+    armazem.adicionar("V1", 5.0, "Moderado", "Consciente", _imagem(9, 300))
+
+    assert armazem.bytes_em_memoria == em_memoria + 300
+    assert len(armazem) == 3
+    assert [r.vitima_id for r in armazem].count("V1") == 1
+    assert armazem.obter_imagem("V1") == _imagem(9, 300)
+
+
+def test_foto_inexistente(armazem):
+    armazem.adicionar("V1", 1.0, "Leve", "Consciente")
+    assert armazem.obter_imagem("V1") is None
+    assert armazem.obter_imagem("V404") is None
+    assert armazem.obter_registro("V404") is None
+    assert "V404" not in armazem
+
+
+def test_fechar_remove_o_arquivo_temporario_e_desativa_o_armazem():
+    armazem = ArmazemFotos(limite_bytes=500)
+    armazem.adicionar("V1", 1.0, "Leve", "Consciente", _imagem(1))
+    caminho = armazem.caminho_arquivo
+    assert os.path.exists(caminho)
+
+    armazem.fechar()
+
+    assert not os.path.exists(caminho)
+    assert armazem.adicionar("V2", 1.0, "Leve", "Consciente", _imagem(2)) is None
+    assert armazem.obter_imagem("V1") is None
+    armazem.fechar()
+
+
+def test_arquivo_informado_nao_e_removido(tmp_path):
+    caminho = str(tmp_path / "fotos.bin")
+    armazem = ArmazemFotos(limite_bytes=0, caminho_arquivo=caminho)
+    armazem.adicionar("V1", 1.0, "Leve", "Consciente", _imagem(1))
+    armazem.fechar()
+    assert os.path.getsize(caminho) == 1000
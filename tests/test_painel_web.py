@@ -0,0 +1,97 @@
+"""Testes da lógica de estado do painel web: patches, rota simplificada e fila dos observadores."""
+import asyncio
+import copy
+import random
+
+import pytest
+
+from painel_web import FILA_MAXIMA_CLIENTE, PONTOS_ROTA, _Observador, calcular_patch, simplificar_rota
+
+
+def _aplicar_patch(alvo, patch):
+    """Aplica um JSON Merge Patch (RFC 7386), como faz a página do painel."""
+    resultado = copy.deepcopy(alvo)
+    for chave, valor in patch.items():
+        if valor is None:
+            resultado.pop(chave, None)
+        elif isinstance(valor, dict):
+            anterior = resultado.get(chave)
+            resultado[chave] = _aplicar_patch(anterior if isinstance(anterior, dict) else {}, valor)
+        else:
+            resultado[chave] = valor
+    return resultado
+
+
+def _estado_aleatorio(rng, profundidade=0):
+    estado = {}
+    for chave in rng.sample("abcdefgh", rng.randint(0, 6)):
+        tipo = rng.random()
+        if tipo < 0.3 and profundidade < 3:
+            estado[chave] = _estado_aleatorio(rng, profundidade + 1)
+        elif tipo < 0.5:
+            estado[chave] = [rng.randint(0, 3) for _ in range(rng.randint(0, 3))]
+        elif tipo < 0.7:
+            estado[chave] = rng.choice(["Explorando", "Alerta", ""])
+        else:
+            estado[chave] = rng.choice([0, 1, 2.5, True, False])
+    return estado
+
+
+@pytest.mark.parametrize("semente", range(50))
+def test_patch_leva_o_estado_antigo_ao_novo(semente):
+    rng = random.Random(semente)
+    antigo, novo = _estado_aleatorio(rng), _estado_aleatorio(rng)
+    assert _aplicar_patch(antigo, calcular_patch(antigo, novo)) == novo
+
+
+def test_patch_remove_chaves_e_omite_o_que_nao_mudou():
+    antigo = {'robo': {'pos_x': 1.0, 'bateria': 99.0}, 'vitimas': {'V1001': {'x': 30}}, 'extra': 1}
+    novo = {'robo': {'pos_x': 2.0, 'bateria': 99.0}, 'vitimas': {}}
+    patch = calcular_patch(antigo, novo)
+    assert patch == {'robo': {'pos_x': 2.0}, 'vitimas': {'V1001': None}, 'extra': None}
+    assert calcular_patch(novo, novo) == {}
+
+
+def test_rota_reta_vira_so_o_destino():
+    rota = [(x * 0.5 + 0.25, 5.25) for x in range(10, 90)]
+    assert simplificar_rota(rota) == [[44.8, 5.2]]
+    # Avançar pela mesma reta não muda o que é enviado.
+    assert simplificar_rota(rota[5:]) == simplificar_rota(rota)
+
+
+def test_rota_guarda_viradas_e_destino():
+    rota = [(x, 5.0) for x in range(5)] + [(4 + i, 5.0 + i) for i in range(1, 4)] + [(7 + i, 8.0) for i in range(1, 3)]
+    assert simplificar_rota(rota) == [[4.0, 5.0], [7.0, 8.0], [9.0, 8.0]]
+    assert simplificar_rota([(3.0, 4.0)]) == [[3.0, 4.0]]
+    assert simplificar_rota([]) == []
+
+
+def test_rota_longa_nao_perde_o_destino():
+    # Zigue-zague com muito mais viradas que PONTOS_ROTA.
+    rota = [(float(x), 5.0 + (x % 2)) for x in range(4 * PONTOS_ROTA)]
+    simplificada = simplificar_rota(rota)
+    assert len(simplificada) == PONTOS_ROTA
+    assert simplificada[-1] == [round(rota[-1][0], 1), round(rota[-1][1], 1)]
+    assert simplificar_rota(rota, limite=1) == [simplificada[-1]]
+
+
+def test_observador_lento_recebe_um_unico_pedido_de_snapshot():
+    async def cenario():
+        observador = _Observador(writer=None)
+        for i in range(FILA_MAXIMA_CLIENTE):
+            observador.enviar(f"patch {i}")
+        for i in range(5):
+            observador.enviar(f"atrasado {i}")
+
+        pendentes = []
+        while not observador.fila.empty():
+            pendentes.append(observador.fila.get_nowait())
+        assert pendentes == [None]
+        assert observador.ressincronizar
+
+        # Depois que o snapshot sai, os patches voltam a entrar na fila.
+        observador.ressincronizar = False
+        observador.enviar("novo")
+        assert observador.fila.get_nowait() == "novo"
+
+    asyncio.run(cenario())
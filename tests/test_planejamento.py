@@ -0,0 +1,113 @@
+"""Testes do planejador de rota (D* Lite) e de uma missão completa sem interface."""
+import datetime
+import random
+import threading
+
+import pytest
+
+import robosoco
+from arquivo_missoes import ArquivoMissoes
+from robosoco import CentralDeControle, Cenario, GradeTunel, PlanejadorRota, Robo, Vitima
+
+
+def _celula_livre(grade, rng):
+    while True:
+        celula = rng.randrange(len(grade.ocupacao))
+        if grade.livre(celula):
+            return celula
+
+
+def _custo_caminho(grade, caminho):
+    total = 0
+    for a, b in zip(caminho, caminho[1:]):
+        passos = dict(grade.vizinhos(a))
+        assert b in passos, "células consecutivas da rota devem ser vizinhas livres"
+        total += passos[b]
+    return total
+
+
+@pytest.mark.parametrize("semente", range(60))
+def test_replanejamento_incremental_igual_ao_do_zero(semente):
+    """Após cada lote de obstáculos, a rota incremental custa o mesmo que uma busca nova."""
+    rng = random.Random(semente)
+    grade = GradeTunel(comprimento=rng.choice([15, 30, 60]))
+    inicio, objetivo = _celula_livre(grade, rng), _celula_livre(grade, rng)
+    planejador = PlanejadorRota(grade)
+    planejador.definir_objetivo(inicio, objetivo)
+
+    for _ in range(12):
+        # O robô às vezes avança pela rota antes do próximo lote de obstáculos.
+        caminho = planejador.caminho()
+        if caminho and len(caminho) > 2 and rng.random() < 0.5:
+            planejador.atualizar_inicio(caminho[rng.randrange(1, len(caminho) - 1)])
+        x0 = rng.uniform(0, grade.colunas * grade.resolucao)
+        y0 = rng.uniform(0, grade.linhas * grade.resolucao)
+        novas = grade.marcar_obstaculo(x0, y0, x0 + rng.uniform(0.5, 4), y0 + rng.uniform(0.5, 4))
+        for celula in (planejador.inicio, objetivo):
+            if celula in novas:
+                grade.ocupacao[celula] = 0
+                novas.remove(celula)
+        planejador.informar_obstaculos(novas)
+
+        do_zero = PlanejadorRota(grade)
+        do_zero.definir_objetivo(planejador.inicio, objetivo)
+        assert planejador.custo() == pytest.approx(do_zero.custo())
+
+        caminho = planejador.caminho()
+        if do_zero.custo() == PlanejadorRota.INFINITO:
+            assert caminho is None
+        else:
+            assert caminho[0] == planejador.inicio and caminho[-1] == objetivo
+            assert all(grade.livre(c) for c in caminho)
+            assert _custo_caminho(grade, caminho) == do_zero._rhs[planejador.inicio]
+
+
+def _executar_missao(cenario, tmp_path, monkeypatch):
+    monkeypatch.setattr(robosoco.time, "sleep", lambda segundos: None)
+    central = CentralDeControle()
+    central.arquivo_missoes = ArquivoMissoes(str(tmp_path / "missoes.db"))
+    central.robo, central.cenario = Robo(), cenario
+    central.simulacao_ativa = True
+    central.inicio_missao = datetime.datetime.now()
+    central._preparar_planejamento()
+    execucao = threading.Thread(target=central._executar_missao_completa, daemon=True)
+    execucao.start()
+    execucao.join(timeout=60)
+    # Um robô preso num tick sem avanço não pode travar a suíte.
+    central.simulacao_ativa = False
+    assert not execucao.is_alive(), "a missão não terminou"
+    central.robo.memoria_fotos.fechar()
+    return central
+
+
+def test_missao_padrao_chega_ao_fim(tmp_path, monkeypatch):
+    central = _executar_missao(Cenario(), tmp_path, monkeypatch)
+
+    assert central.missao_concluida
+    assert central.robo.posicao_atual >= central.cenario.comprimento
+    assert len(central.vitimas_detectadas) == len(central.cenario.objetos)
+    assert all(v.foto_tirada for v in central.cenario.objetos)
+    assert all(v.kit_aplicado for v in central.cenario.objetos if v.gravidade_inicial != "Leve")
+    # Sensores nominais: a taxa de variação usa o instante do pacote, não o relógio da execução.
+    assert not [alerta for alerta in central.alertas if alerta[2] == "PERIGO"]
+    colunas, linhas = central.arquivo_missoes.consultar('missoes', limite=1)
+    assert linhas and linhas[0][colunas.index('status')] == central.resumo_missao()['status']
+
+
+def test_vitimas_proximas_sao_ambas_atendidas(tmp_path, monkeypatch):
+    cenario = Cenario()
+    cenario.objetos = [Vitima(x=30, y=5, gravidade="Grave"), Vitima(x=33, y=6, gravidade="Crítico")]
+    central = _executar_missao(cenario, tmp_path, monkeypatch)
+
+    assert central.robo.posicao_atual >= cenario.comprimento
+    assert all(v.foto_tirada and v.kit_aplicado for v in cenario.objetos)
+
+
+@pytest.mark.parametrize("obstaculo", [(60, 4, 100, 6), (196, 4, 200, 6)])
+def test_meta_de_exploracao_bloqueada_nao_interrompe(obstaculo, tmp_path, monkeypatch):
+    cenario = Cenario()
+    cenario.objetos = []
+    cenario.obstaculos = [obstaculo]
+    central = _executar_missao(cenario, tmp_path, monkeypatch)
+
+    assert central.robo.posicao_atual >= cenario.comprimento
@@ -0,0 +1,101 @@
+"""Testes da janela deslizante de sensores e do analisador de alertas."""
+import math
+import random
+import statistics
+
+import pytest
+
+from robosoco import LIMITES_SENSORES, AnalisadorSensores, JanelaSensor
+
+
+@pytest.mark.parametrize("semente", range(20))
+def test_janela_confere_com_forca_bruta(semente):
+    rng = random.Random(semente)
+    tamanho = rng.choice([1, 2, 5, 17, 120])
+    janela = JanelaSensor(tamanho=tamanho)
+    amostras = []
+    for instante in range(rng.randint(1, 400)):
+        # Mistura ruído, degraus e picos raros para exercitar o cancelamento.
+        valor = rng.gauss(0, 1) if rng.random() > 0.02 else rng.uniform(-1e6, 1e6)
+        assert janela.adicionar(valor, instante)
+        amostras.append(valor)
+        recentes = amostras[-tamanho:]
+
+        assert len(janela) == len(recentes)
+        assert janela.ultimo == valor
+        assert janela.minimo == min(recentes)
+        assert janela.maximo == max(recentes)
+        escala = max(1.0, max(abs(v) for v in recentes))
+        assert janela.media == pytest.approx(statistics.fmean(recentes), abs=1e-9 * escala)
+        if len(recentes) > 1:
+            assert janela.variancia == pytest.approx(statistics.variance(recentes), rel=1e-6, abs=1e-9 * escala)
+
+
+def test_pico_que_sai_da_janela_nao_deixa_erro():
+    janela = JanelaSensor(tamanho=5)
+    for instante, valor in enumerate([1e8, 1, 2, 3, 4, 5, 6, 7, 8]):
+        janela.adicionar(valor, instante)
+    assert janela.variancia == pytest.approx(2.5)
+    assert janela.media == pytest.approx(6.0)
+
+
+@pytest.mark.parametrize("valor", [math.nan, math.inf, -math.inf])
+def test_leitura_nao_finita_e_descartada(valor):
+    janela = JanelaSensor(tamanho=4)
+    for instante, v in enumerate([1.0, 2.0, 3.0]):
+        janela.adicionar(v, instante)
+    assert not janela.adicionar(valor, 3)
+    assert len(janela) == 3
+    assert (janela.media, janela.minimo, janela.maximo) == (2.0, 1.0, 3.0)
+    assert janela.variancia == pytest.approx(1.0)
+
+
+def test_taxa_usa_o_instante_da_amostra():
+    janela = JanelaSensor(alfa=1.0)
+    janela.adicionar(20.0, 0.0)
+    janela.adicionar(21.0, 2.0)
+    assert janela.taxa == pytest.approx(0.5)
+
+
+def _alertas_de_limite(analisador, valores, sensor='gas'):
+    disparos = []
+    for instante, valor in enumerate(valores):
+        if any("elevado" in mensagem for _, mensagem in analisador.processar({sensor: valor}, instante)):
+            disparos.append(instante)
+    return disparos
+
+
+def test_alerta_de_limite_dispara_so_na_transicao():
+    analisador = AnalisadorSensores()
+    disparos = _alertas_de_limite(analisador, [0.2] * 5 + [0.9] * 20)
+    assert len(disparos) == 1
+
+
+def test_histerese_segura_o_alerta_perto_do_limite():
+    limite = LIMITES_SENSORES['gas']['maximo']
+    histerese = LIMITES_SENSORES['gas']['histerese']
+    analisador = AnalisadorSensores()
+    # Sobe, oscila logo abaixo do limite (dentro da histerese), cai de vez e sobe de novo.
+    oscilando = [limite - histerese / 2, limite + 0.01] * 10
+    disparos = _alertas_de_limite(analisador, [0.1] * 5 + [0.9] * 15 + oscilando + [0.0] * 20 + [0.9] * 15)
+    assert len(disparos) == 2
+
+
+def test_leituras_nominais_nao_geram_alertas():
+    rng = random.Random(7)
+    analisador = AnalisadorSensores()
+    for instante in range(2000):
+        sensores = {
+            'temp': round(25 + rng.uniform(-1, 3), 1),
+            'risco_estrutural': rng.randint(1, 3),
+            'gas': round(rng.uniform(0, 0.5), 2),
+        }
+        assert analisador.processar(sensores, instante * 0.5) == []
+
+
+def test_limites_personalizados_no_resumo():
+    analisador = AnalisadorSensores({'pressao': {'nome': 'Pressão', 'unidade': 'kPa', 'maximo': 200.0}})
+    assert analisador.resumo('pressao') == "--"
+    assert analisador.processar({'pressao': 250.0, 'gas': 5.0}, 0.0) == [
+        ("PERIGO", "Pressão elevado(a): 250.00kPa (limite 200.0kPa)")]
+    assert analisador.resumo('pressao').startswith("250.00kPa")